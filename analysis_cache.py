@@ -0,0 +1,81 @@
+"""In-memory LRU cache of DataProcessor analyses.
+
+Keys are DataProcessor.analysis_key(): the parsed content's fingerprint, the x and y
+columns and the analysis parameters, so flipping back to an axis pair or reopening a
+specimen restores its results, arrays and indexes instead of recomputing them. The
+parsed table itself is not part of an entry. Entries are evicted least recently used
+first once there are more than max_entries or they hold more than max_bytes.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from data_processor import buffer_bytes
+
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_BYTES = 1024 ** 3
+
+
+def _state_arrays(state):
+    """Return the arrays held by an analysis state, including those inside its indexes."""
+    arrays = []
+    for value in state.values():
+        if isinstance(value, np.ndarray):
+            arrays.append(value)
+        elif value is not None and hasattr(value, '__dict__'):
+            arrays.extend(item for item in vars(value).values() if isinstance(item, np.ndarray))
+    return arrays
+
+
+class AnalysisCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Analyses run on worker threads while the window reads the cache
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the state stored under key and mark it recently used, or None on a miss."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, state):
+        """Store an analysis state, evicting the least recently used entries over the limits."""
+        size = buffer_bytes(_state_arrays(state))
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (state, size)
+            self.nbytes += size
+            while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self.entries), 'bytes': self.nbytes, 'hits': self.hits, 'misses': self.misses}
+
+
+analysis_cache = AnalysisCache()
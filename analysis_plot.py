@@ -0,0 +1,154 @@
+"""The annotated plot of one analysed specimen, built on any matplotlib axes.
+
+AnalysisPlot holds no Qt state: PlotWindow draws it on its interactive canvas and
+report.py renders it with the Agg backend. Every artist is created once; show()
+fills them from an analysed DataProcessor and show_points() moves only the
+draggable points and the values that follow them. The curve is drawn as a
+min/max-decimated scatter at the axes' pixel width, so the cost of a draw does
+not grow with the number of samples.
+"""
+import numpy as np
+
+from decimation import minmax_decimate
+
+TEXT_BOX = dict(facecolor='white', edgecolor='blue', alpha=0.8, boxstyle='round,pad=0.5')
+
+
+class AnalysisPlot:
+    def __init__(self, ax):
+        self.ax = ax
+        self.processor = None
+        # Scatter of the curve, reduced to about one min/max pair per pixel column
+        self.data_scatter = ax.scatter([], [], alpha=0.5, color='#1f77b4', s=10)
+        # Highlight the max point in Load 1
+        self.max_point = ax.scatter([], [], color='red', s=100, label='Maximum Strength')
+        self.max_point_annotation = ax.annotate('',
+                    xy=(0, 0),
+                    xytext=(10, 10),
+                    textcoords='offset points',
+                    color='red')
+        self.stiffness_line, = ax.plot([], [], color='purple', linewidth=2,
+                label=f'Stiffness')
+        # Add interactive points
+        self.interactive_points = [
+            ax.scatter([], [], color='blue', s=100, picker=True),
+            ax.scatter([], [], color='blue', s=100, picker=True),
+            ax.scatter([], [], color='green', s=100, picker=True, label='Yield Point')
+        ]
+        # Draw line between blue interactive points only
+        self.interactive_line, = ax.plot([], [], 'b--', linewidth=1)
+        self.custom_slope_point_one_annotation = self.point_annotation((20, 20), 'blue')
+        self.custom_slope_point_two_annotation = self.point_annotation((20, -20), 'blue')
+        self.yield_point_annotation = self.point_annotation((-80, 20), 'green')
+
+        # Add slope text boxes with better positioning and styling
+        self.max_slope_text = ax.text(0.02, 0.98, '', transform=ax.transAxes, bbox=TEXT_BOX,
+                                      verticalalignment='top', color='blue', fontsize=10)
+        self.slope_annotation = self.text_box(0.92)
+        # Add area under curve text box
+        self.area_text = self.text_box(0.86)
+        # Energies up to the peak and the marked points, updated while points are dragged
+        self.partial_area_text = self.text_box(0.80)
+
+        # Style the plot
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.legend(loc='lower right')
+        # Add some padding to the layout
+        ax.figure.subplots_adjust(left=0.15, right=0.95, top=0.95, bottom=0.15)
+
+    def point_annotation(self, offset, color):
+        return self.ax.annotate('', xy=(0, 0), xytext=offset, textcoords='offset points', color=color)
+
+    def text_box(self, y):
+        return self.ax.text(0.02, y, '', transform=self.ax.transAxes, bbox=TEXT_BOX, verticalalignment='top',
+                            horizontalalignment='left', color='blue', fontsize=10, zorder=1000)
+
+    def show(self, processor, x_col, y_col):
+        """Fill every artist from processor, analysed for x_col and y_col, and fit the view to it.
+
+        The curve itself is filled by show_curve, once the axes have their final size.
+        """
+        self.processor = processor
+        ax = self.ax
+        max_value = processor.max_value
+        max_x = processor.max_x
+        self.max_point.set_offsets([max_x, max_value])
+        self.max_point_annotation.xy = (max_x, max_value)
+        self.max_point_annotation.set_text(f'({max_x}, {max_value})')
+        (x1, y1), (x2, y2) = processor.line_points
+        self.stiffness_line.set_data([x1, x2], [y1, y2])
+        self.max_slope_text.set_text(f'Calculated Max Slope: {processor.max_slope:.4f}')
+        self.area_text.set_text(f'Area: {processor.area_under_curve:.4f}')
+        self.show_points()
+        ax.set_xlabel(y_col, fontsize=12)
+        ax.set_ylabel(x_col, fontsize=12)
+
+        # Autoscale from the data bounds and the marker positions rather than every artist
+        sample_index = processor.sample_index
+        y_values = sample_index.sorted_y
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim([
+            (sample_index.sorted_x[0], y_values.min()),
+            (sample_index.sorted_x[-1], y_values.max()),
+            (x1, y1), (x2, y2),
+        ])
+        ax.autoscale_view()
+
+    def show_points(self):
+        """Move the slope and yield points to the processor's and update the values that follow them."""
+        self.show_slope_point_one()
+        self.show_slope_point_two()
+        self.show_yield_point()
+        self.show_slope()
+        self.show_partial_areas()
+
+    def move_point_annotation(self, annotation, x, y):
+        annotation.xy = (x, y)
+        annotation.set_text(f'({x:.4f}, {y:.4f})')
+
+    def show_slope_point_one(self):
+        x, y = self.processor.custom_slope_point_one
+        self.interactive_points[0].set_offsets([x, y])
+        self.move_point_annotation(self.custom_slope_point_one_annotation, x, y)
+
+    def show_slope_point_two(self):
+        x, y = self.processor.custom_slope_point_two
+        self.interactive_points[1].set_offsets([x, y])
+        self.move_point_annotation(self.custom_slope_point_two_annotation, x, y)
+
+    def show_yield_point(self):
+        x, y = self.processor.yield_displacement, self.processor.yield_strength
+        self.interactive_points[2].set_offsets([x, y])
+        self.move_point_annotation(self.yield_point_annotation, x, y)
+
+    def show_slope(self):
+        processor = self.processor
+        self.interactive_line.set_data(
+            [processor.custom_slope_point_one[0], processor.custom_slope_point_two[0]],
+            [processor.custom_slope_point_one[1], processor.custom_slope_point_two[1]]
+        )
+        processor.calculate_custom_slope()
+        self.slope_annotation.set_text(f'Current Slope: {processor.custom_slope:.4f}')
+
+    def show_partial_areas(self):
+        processor = self.processor
+        processor.calculate_partial_areas()
+        lines = [f'Area to peak: {processor.area_to_peak:.4f}',
+                 f'Area to yield: {processor.area_to_yield:.4f}']
+        if processor.area_between_points is not None:
+            lines.append(f'Area between points: {processor.area_between_points:.4f}')
+        self.partial_area_text.set_text('\n'.join(lines))
+
+    def decimated_curve(self, x_min, x_max):
+        """Return the samples to draw for the visible x range, at the axes' pixel resolution."""
+        return minmax_decimate(self.processor.sample_index, x_min, x_max,
+                               max(int(self.ax.bbox.width), 1), self.processor.key_sample_indices())
+
+    def show_curve(self):
+        """Fill the scatter with the curve reduced for the current x range."""
+        if self.processor is None:
+            return
+        x_min, x_max = sorted(self.ax.get_xlim())
+        self.data_scatter.set_offsets(np.column_stack(self.decimated_curve(x_min, x_max)))
@@ -0,0 +1,135 @@
+import copy
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from analysis_cache import analysis_cache
+from data_processor import DataProcessor
+from parse_cache import ParseCache
+
+# Share of the progress bar given to reading the file; the analysis takes the rest
+READ_PROGRESS = 80
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a job to stop it once it has been cancelled."""
+
+
+class AnalysisSignals(QObject):
+    # job id, percent done, stage
+    progress = pyqtSignal(int, int, str)
+    # job id, analysed DataProcessor
+    finished = pyqtSignal(int, object)
+    # job id, error message
+    failed = pyqtSignal(int, str)
+
+
+class AnalysisJob(QRunnable):
+    """Load a file (or reuse a loaded processor) and analyse the chosen axes off the GUI thread.
+
+    The job works on its own DataProcessor: a new one for a file, or a shallow copy of
+    an existing one for an axis change, so the processor shown in the window is never
+    modified while it is being drawn. Analyses are shared through the AnalysisCache.
+    """
+
+    def __init__(self, job_id, x_col, y_col, file_path=None, processor=None):
+        super().__init__()
+        self.job_id = job_id
+        self.x_col = x_col
+        self.y_col = y_col
+        self.file_path = file_path
+        self.processor = processor
+        self.signals = AnalysisSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise AnalysisCancelled()
+
+    def on_read_progress(self, done, total):
+        self.check_cancelled()
+        self.signals.progress.emit(self.job_id, done * READ_PROGRESS // max(total, 1), "Reading")
+
+    def run(self):
+        try:
+            if self.processor is None:
+                self.signals.progress.emit(self.job_id, 0, "Reading")
+                processor = DataProcessor(self.file_path, streaming=True, progress=self.on_read_progress,
+                                          cache=ParseCache())
+            else:
+                processor = copy.copy(self.processor)
+            self.check_cancelled()
+            self.signals.progress.emit(self.job_id, READ_PROGRESS, "Analysing")
+            processor.set_columns(self.x_col, self.y_col, cache=analysis_cache)
+            self.check_cancelled()
+            if processor.line_points is None:
+                raise ValueError(f"No stiffness line could be fitted: too few samples of {self.x_col} "
+                                 f"in the fit window {processor.config.fit_window}")
+        except Exception as e:
+            # A cancelled job ends quietly, whatever it was interrupted with
+            if not self.cancel_event.is_set():
+                self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.progress.emit(self.job_id, 100, "Done")
+        self.signals.finished.emit(self.job_id, processor)
+
+
+class AnalysisRunner(QObject):
+    """Run one analysis at a time on a thread pool and report only the latest one.
+
+    Submitting a job cancels the one before it; results and progress of any job other
+    than the latest are dropped, so a slow stale job can never replace newer data.
+    """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.job = None
+        self.last_job_id = 0
+
+    def is_running(self):
+        return self.job is not None
+
+    def submit(self, x_col, y_col, file_path=None, processor=None):
+        """Start analysing file_path, or processor for new axes, and return the job id."""
+        self.cancel()
+        self.last_job_id += 1
+        self.job = AnalysisJob(self.last_job_id, x_col, y_col, file_path, processor)
+        self.job.signals.progress.connect(self.on_job_progress)
+        self.job.signals.finished.connect(self.on_job_finished)
+        self.job.signals.failed.connect(self.on_job_failed)
+        self.pool.start(self.job)
+        return self.last_job_id
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
+    def wait(self, msecs=-1):
+        """Block until the pool's jobs, including cancelled ones, have returned."""
+        return self.pool.waitForDone(msecs)
+
+    def is_current(self, job_id):
+        return self.job is not None and self.job.job_id == job_id
+
+    @pyqtSlot(int, int, str)
+    def on_job_progress(self, job_id, percent, stage):
+        if self.is_current(job_id):
+            self.progress.emit(percent, stage)
+
+    @pyqtSlot(int, object)
+    def on_job_finished(self, job_id, processor):
+        if self.is_current(job_id):
+            self.job = None
+            self.finished.emit(processor)
+
+    @pyqtSlot(int, str)
+    def on_job_failed(self, job_id, message):
+        if self.is_current(job_id):
+            self.job = None
+            self.failed.emit(message)
@@ -0,0 +1,135 @@
+"""Analyze every test log under a folder without the GUI.
+
+Usage: python batch.py FOLDER [--output CSV_OR_SQLITE] [--workers N] [--resume]
+
+Each .txt file runs through the same DataProcessor pipeline as the plot window, in a
+process pool sized to the CPU count. Finished files are journaled next to the output
+so an interrupted run can continue with --resume; the results go to the results store
+in one bulk write at the end. Specimens in subfolders are named by their path relative
+to FOLDER, so files with the same name in different subfolders keep separate rows.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from data_processor import DataProcessor
+from results_store import CSV_FILE_NAME, open_results_store
+
+X_COLUMN = 'Display 1'
+Y_COLUMN = 'Load 1'
+
+
+def find_test_files(folder):
+    """Return the .txt files under folder, in a stable order."""
+    test_files = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        test_files.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.txt'))
+    return test_files
+
+
+def specimen_name(folder, file_path):
+    """Return the results-store name of a file: its path relative to folder, without extension.
+
+    Files directly in folder get the plain file name the plot window exports.
+    """
+    relative_dir = os.path.relpath(os.path.dirname(os.path.abspath(file_path)), os.path.abspath(folder))
+    name = os.path.basename(file_path).split('.')[0]
+    return name if relative_dir == os.curdir else '/'.join([*relative_dir.split(os.sep), name])
+
+
+def analyze_file(file_path, x_col=X_COLUMN, y_col=Y_COLUMN, stop_at_failure=False, float32=False):
+    """Run the analysis pipeline on one file; returns (file_path, row, error)."""
+    try:
+        processor = DataProcessor(file_path, streaming=True, stop_at_failure=stop_at_failure, float32=float32,
+                                  failure_column=y_col)
+        processor.set_columns(x_col, y_col)
+        row = {key: (None if value is None else value if key == 'file name' else float(value))
+               for key, value in processor.mechanical_properties().items()}
+        return file_path, row, None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def load_journal(journal_path):
+    """Return {file path: row} for the files a previous run finished."""
+    finished = {}
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r') as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short by the interruption
+                    continue
+                if entry.get('row') is not None:
+                    finished[entry['path']] = entry['row']
+    return finished
+
+
+def run(folder, output_path, workers=None, resume=False, x_col=X_COLUMN, y_col=Y_COLUMN, stop_at_failure=False,
+        float32=False):
+    """Analyze all files under folder; returns {file path: error} for the files that failed."""
+    journal_path = output_path + '.progress.jsonl'
+    test_files = find_test_files(folder)
+    finished = load_journal(journal_path) if resume else {}
+    pending = [path for path in test_files if path not in finished]
+    failures = {}
+
+    total = len(test_files)
+    done = total - len(pending)
+    if done:
+        print(f"Resuming: {done} of {total} files already analyzed", file=sys.stderr)
+    with open(journal_path, 'a' if resume else 'w') as journal, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        if journal.tell() > 0:
+            # Terminate a line an interruption may have cut short
+            journal.write('\n')
+        futures = [executor.submit(analyze_file, path, x_col, y_col, stop_at_failure, float32) for path in pending]
+        for future in as_completed(futures):
+            file_path, row, error = future.result()
+            done += 1
+            journal.write(json.dumps({'path': file_path, 'row': row, 'error': error}) + '\n')
+            journal.flush()
+            if error is None:
+                finished[file_path] = row
+                print(f"[{done}/{total}] {file_path}", file=sys.stderr)
+            else:
+                failures[file_path] = error
+                print(f"[{done}/{total}] {file_path}: FAILED ({error})", file=sys.stderr)
+
+    rows = [{**finished[path], 'file name': specimen_name(folder, path)} for path in test_files if path in finished]
+    open_results_store(output_path).upsert_many(rows)
+    os.remove(journal_path)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze every test log under a folder.")
+    parser.add_argument('folder', help="folder searched recursively for .txt test logs")
+    parser.add_argument('--output', help="results CSV, or a .sqlite database (default: FOLDER/mechanical property.csv)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--resume', action='store_true', help="skip files finished by an interrupted run")
+    parser.add_argument('--stop-at-failure', action='store_true',
+                        help="stop decoding each file once the failure drop in the Y column has been read")
+    parser.add_argument('--float32', action='store_true',
+                        help="hold each specimen in float32 to halve worker memory")
+    parser.add_argument('--x-column', default=X_COLUMN)
+    parser.add_argument('--y-column', default=Y_COLUMN)
+    args = parser.parse_args(argv)
+
+    output_path = args.output or os.path.join(args.folder, CSV_FILE_NAME)
+    failures = run(args.folder, output_path, args.workers, args.resume, args.x_column, args.y_column,
+                   args.stop_at_failure, args.float32)
+    if failures:
+        print(f"{len(failures)} file(s) failed:", file=sys.stderr)
+        for file_path, error in failures.items():
+            print(f"  {file_path}: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
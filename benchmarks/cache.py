@@ -0,0 +1,42 @@
+"""Time loading a test file from text against loading it from the parse cache.
+
+Usage: python -m benchmarks.cache [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from data_processor import DataProcessor
+from parse_cache import ParseCache
+from benchmarks.synthetic import write_test_file
+
+
+def timed_load(file_path, cache):
+    start = time.perf_counter()
+    processor = DataProcessor(file_path, streaming=True, cache=cache)
+    return processor.table, time.perf_counter() - start
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**6, 3 * 10**6]
+    print(f"{'rows':>10} {'parse [s]':>10} {'hit [ms]':>9} {'after edit [s]':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ParseCache(os.path.join(folder, "cache"))
+        for rows in sizes:
+            file_path = os.path.join(folder, f"specimen_{rows}.txt")
+            write_test_file(file_path, rows)
+            parsed, parse_time = timed_load(file_path, cache)
+            cached, hit_time = timed_load(file_path, cache)
+            assert np.array_equal(parsed, cached), "cached table differs from the parsed one"
+            # A changed source file must miss and be parsed again
+            with open(file_path, 'a') as file:
+                file.write("Axial Counts\t0\t0\n")
+            _, edit_time = timed_load(file_path, cache)
+            print(f"{rows:>10} {parse_time:>10.3f} {hit_time * 1000:>9.1f} {edit_time:>15.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,76 @@
+"""Check find_consensus_line against the exhaustive search and time both.
+
+Usage: python -m benchmarks.consensus [points ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from data_processor import find_consensus_line
+
+
+def brute_force_consensus_line(points, slope, tolerance):
+    """The O(n^2) offset search calculate_max_slope used before find_consensus_line."""
+    best_offset = None
+    max_points_count = 0
+    points_on_best_line = None
+    for point in points:
+        offset = point[1] - slope * point[0]
+        y_predicted = slope * points[:, 0] + offset
+        points_on_line = np.abs(points[:, 1] - y_predicted) < tolerance
+        points_count = np.sum(points_on_line)
+        if points_count > max_points_count:
+            max_points_count = points_count
+            best_offset = offset
+            points_on_best_line = points_on_line
+    return best_offset, points_on_best_line
+
+
+def equivalence_cases(rng):
+    """Yield (name, points, slope, tolerance) covering noise, ties and window-edge cases."""
+    for n in (1, 2, 3, 10, 500):
+        x = np.sort(rng.uniform(0.01, 0.1, n))
+        yield f"noisy line n={n}", np.column_stack([x, 300 * x + rng.normal(0, 0.05, n)]), 300.0, 0.05
+    x = np.sort(rng.uniform(0.01, 0.1, 400))
+    yield "curved", np.column_stack([x, 300 * x - 900 * x ** 2]), 280.0, 0.05
+    yield "duplicates", np.repeat(np.column_stack([x[:50], 300 * x[:50]]), 3, axis=0), 300.0, 0.05
+    # Intercepts on an exact grid of the tolerance put points on the window edges
+    x = np.round(np.linspace(0.01, 0.1, 300), 4)
+    yield "edge grid", np.column_stack([x, 2.0 * x + np.round(rng.integers(0, 6, 300) * 0.05, 2)]), 2.0, 0.05
+    yield "zero slope ties", np.column_stack([x, np.tile([0.0, 0.05, 0.1], 100)]), 0.0, 0.05
+    x = np.round(rng.uniform(0.01, 0.1, 300), 3)
+    yield "quantized", np.column_stack([x, np.round(150 * x + rng.normal(0, 0.03, 300), 4)]), 150.0, 0.05
+
+
+def check_equivalence(seeds=20):
+    cases = 0
+    for seed in range(seeds):
+        for name, points, slope, tolerance in equivalence_cases(np.random.default_rng(seed)):
+            expected_offset, expected_mask = brute_force_consensus_line(points, slope, tolerance)
+            offset, mask = find_consensus_line(points, slope, tolerance)
+            if offset != expected_offset or not np.array_equal(mask, expected_mask):
+                raise SystemExit(f"find_consensus_line disagrees on case '{name}' (seed {seed})")
+            cases += 1
+    print(f"{cases} equivalence cases passed")
+
+
+def main(argv):
+    check_equivalence()
+    sizes = [int(float(arg)) for arg in argv] or [10**3, 10**4, 3 * 10**4]
+    rng = np.random.default_rng(0)
+    print(f"{'points':>8} {'brute force [s]':>16} {'sorted [s]':>11} {'speedup':>8}")
+    for n in sizes:
+        x = np.sort(rng.uniform(0.01, 0.1, n))
+        points = np.column_stack([x, 300 * x + rng.normal(0, 0.05, n)])
+        start = time.perf_counter()
+        brute_force_consensus_line(points, 300.0, 0.05)
+        brute_time = time.perf_counter() - start
+        start = time.perf_counter()
+        find_consensus_line(points, 300.0, 0.05)
+        fast_time = time.perf_counter() - start
+        print(f"{n:>8} {brute_time:>16.3f} {fast_time:>11.4f} {brute_time / fast_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
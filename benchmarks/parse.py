@@ -0,0 +1,54 @@
+"""Compare the vectorized parser with the original line-by-line parser.
+
+Usage: python -m benchmarks.parse [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_processor import COLUMNS, parse_table
+from benchmarks.synthetic import write_test_file
+
+
+def legacy_parse(file_path):
+    """The list-comprehension parser process_data used before parse_table."""
+    with open(file_path, 'r') as file:
+        raw_data = file.readlines()
+    raw_data = [line for line in raw_data if line[:12] != "Axial Counts"][5:]
+    clean_data = [[x.strip() for x in line.split(',' if ',' in raw_data[0] else '\t') if x.strip()][1:6] for line in raw_data]
+    return pd.DataFrame(clean_data, columns=COLUMNS).astype(float).to_numpy()
+
+
+def fast_parse(file_path):
+    with open(file_path, 'r') as file:
+        return parse_table(file.read())
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**5, 10**6, 10**7]
+    print(f"{'rows':>10} {'legacy [s]':>12} {'fast [s]':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in sizes:
+            file_path = os.path.join(folder, f"bench_{rows}.txt")
+            write_test_file(file_path, rows)
+            expected, legacy_time = timed(legacy_parse, file_path)
+            table, fast_time = timed(fast_parse, file_path)
+            if not np.array_equal(expected, table):
+                raise SystemExit(f"parse_table disagrees with the legacy parser for {rows} rows")
+            del expected, table
+            os.remove(file_path)
+            print(f"{rows:>10} {legacy_time:>12.3f} {fast_time:>10.3f} {legacy_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
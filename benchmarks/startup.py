@@ -0,0 +1,87 @@
+"""Measure time-to-first-window and the import cost of each application module.
+
+Usage: python -m benchmarks.startup [--runs N] [--offscreen]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["PyQt6.QtWidgets", "main_window", "numpy", "pandas", "matplotlib",
+           "matplotlib.backends.backend_qtagg", "data_processor", "plot_window"]
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib"]
+
+FIRST_WINDOW = """
+import sys
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+from main_window import MainWindow
+
+def shown():
+    loaded = [name for name in {heavy!r} if name in sys.modules]
+    print("shown", ",".join(loaded), flush=True)
+    app.quit()
+
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def time_to_first_window(env):
+    """Return seconds from interpreter launch until the landing window has been shown."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", FIRST_WINDOW.format(heavy=HEAVY_MODULES)],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    elapsed = time.perf_counter() - start
+    line = next(line for line in output.splitlines() if line.startswith("shown"))
+    loaded = line.split(" ", 1)[1] if " " in line else ""
+    return elapsed, loaded
+
+
+def import_costs(env):
+    """Return {module: cumulative import time in seconds} using python -X importtime."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main_window, data_processor, plot_window"],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stderr
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name in MODULES and cumulative.strip().isdigit():
+            costs[name] = int(cumulative) / 1e6
+    return costs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup benchmark for main.py.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="use the offscreen Qt platform")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    times = []
+    loaded = ""
+    for _ in range(args.runs):
+        elapsed, loaded = time_to_first_window(env)
+        times.append(elapsed)
+    print(f"time to first window: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms over {args.runs} runs")
+    print(f"heavy modules loaded at first window: {loaded or 'none'}")
+
+    print("\ncumulative import cost:")
+    for name, seconds in sorted(import_costs(env).items(), key=lambda item: -item[1]):
+        print(f"  {name:<36} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Time each stage of the analysis pipeline on synthetic logs and save the results as JSON.
+
+Usage: python -m benchmarks.suite [rows ...] [--output results.json] [--compare baseline.json]
+
+Stages: process_file (text parse), process_data, calculate_max_slope,
+calculate_area_under_curve, the whole set_columns, and the nearest-sample queries
+on_motion makes while a point is dragged (per query). Each stage reports the best and
+median of several runs. --compare prints the ratio to an earlier run and exits with
+status 1 when a stage got slower than --threshold times the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from benchmarks.synthetic import write_test_file
+
+X_COLUMN = 'Display 1'
+Y_COLUMN = 'Load 1'
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+NEAREST_QUERIES = 1000
+
+
+def default_repeats(rows):
+    return 7 if rows <= 10**5 else 3 if rows <= 10**6 else 1
+
+
+def measure(func, repeats):
+    """Return the run times of func over repeats calls."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summary(times, per=1):
+    return {"best": min(times) / per, "median": statistics.median(times) / per, "repeats": len(times)}
+
+
+def benchmark_file(file_path, repeats):
+    """Return {stage: summary} for one file."""
+    results = {}
+    processor = DataProcessor()
+    results["process_file"] = summary(measure(lambda: processor.process_file(file_path), repeats))
+    results["process_data"] = summary(measure(lambda: processor.process_data(X_COLUMN, Y_COLUMN), repeats))
+    results["calculate_max_slope"] = summary(measure(lambda: processor.calculate_max_slope(X_COLUMN, Y_COLUMN), repeats))
+    results["set_columns"] = summary(measure(lambda: processor.set_columns(X_COLUMN, Y_COLUMN), repeats))
+    results["calculate_area_under_curve"] = summary(
+        measure(lambda: processor.calculate_area_under_curve(X_COLUMN, Y_COLUMN), repeats))
+
+    # Cursor positions spread over the curve, as a drag would produce
+    sample_index = processor.sample_index
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(sample_index.sorted_x[0], sample_index.sorted_x[-1], NEAREST_QUERIES)
+    ys = np.interp(xs, sample_index.sorted_x, sample_index.sorted_y)
+    x_scale = 800 / (sample_index.sorted_x[-1] - sample_index.sorted_x[0])
+    y_scale = 600 / (sample_index.sorted_y.max() - sample_index.sorted_y.min())
+    results["nearest_point"] = summary(
+        measure(lambda: [sample_index.nearest(x) for x in xs], repeats), NEAREST_QUERIES)
+    results["nearest_point_on_screen"] = summary(
+        measure(lambda: [sample_index.nearest_on_screen(x, y, x_scale, y_scale) for x, y in zip(xs, ys)], repeats),
+        NEAREST_QUERIES)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print current/baseline best-time ratios; return the (rows, stage) pairs slower than threshold."""
+    regressions = []
+    print(f"\n{'rows':>10} {'stage':<28} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for rows, stages in results.items():
+        for stage, current in stages.items():
+            previous = baseline.get(rows, {}).get(stage)
+            if previous is None:
+                continue
+            ratio = current["best"] / previous["best"]
+            flag = " slower" if ratio > threshold else ""
+            print(f"{rows:>10} {stage:<28} {previous['best'] * 1000:>10.3f}ms {current['best'] * 1000:>10.3f}ms "
+                  f"{ratio:>6.2f}x{flag}")
+            if ratio > threshold:
+                regressions.append((rows, stage))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic logs.")
+    parser.add_argument("rows", nargs="*", type=float, help="rows per generated file (default 1e3 1e4 1e5 1e6)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="ratio to the baseline's best time reported as a regression")
+    parser.add_argument("--repeats", type=int, help="runs per stage (default depends on the size)")
+    args = parser.parse_args(argv)
+    sizes = [int(rows) for rows in args.rows] or DEFAULT_SIZES
+
+    results = {}
+    print(f"{'rows':>10} {'stage':<28} {'best':>12} {'median':>12}")
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in sizes:
+            file_path = os.path.join(folder, f"bench_{rows}.txt")
+            write_test_file(file_path, rows)
+            stages = benchmark_file(file_path, args.repeats or default_repeats(rows))
+            os.remove(file_path)
+            results[str(rows)] = stages
+            for stage, timing in stages.items():
+                print(f"{rows:>10} {stage:<28} {timing['best'] * 1000:>10.3f}ms {timing['median'] * 1000:>10.3f}ms")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
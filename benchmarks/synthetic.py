@@ -0,0 +1,76 @@
+"""Synthetic three-point bending logs in the layout process_file expects.
+
+The curve has a linear elastic region, a softening region up to the peak, a failure
+drop of a large fraction of the load and a slowly decaying residual tail, with sensor
+noise on both channels. Like the machine's logs, the values are written sign-flipped,
+the displacement starts from a small offset and "Axial Counts" lines appear between
+data lines at irregular intervals.
+"""
+import numpy as np
+import pandas as pd
+
+HEADER = [
+    "Three Point Bending Test\n",
+    "Station: Synthetic\n",
+    "Specimen: Benchmark\n",
+    "Data Acquisition\n",
+    "Points\tElapsed Time\tScan Time\tDisplay 1\tLoad 1\tLoad 2\n",
+]
+# Shape of the curve, in mm and N
+STIFFNESS = 300.0
+PROPORTIONAL_LIMIT = 0.3
+PEAK_DISPLACEMENT = 0.8
+FAILURE_DISPLACEMENT = 1.2
+FAILURE_LOSS = 0.7
+DISPLACEMENT_OFFSET = 0.01
+LOAD_NOISE = 0.05
+DISPLACEMENT_NOISE = 1e-5
+# Mean number of data lines between "Axial Counts" lines
+AXIAL_COUNTS_INTERVAL = 100
+
+
+def load_curve(displacement):
+    """Return the load for each displacement: linear, softening to the peak, then failure."""
+    softening = STIFFNESS / (2 * (PEAK_DISPLACEMENT - PROPORTIONAL_LIMIT))
+    load = STIFFNESS * displacement - softening * np.clip(displacement - PROPORTIONAL_LIMIT, 0, None) ** 2
+    peak_load = STIFFNESS * PEAK_DISPLACEMENT - softening * (PEAK_DISPLACEMENT - PROPORTIONAL_LIMIT) ** 2
+    # The load holds near the peak until failure, then drops and decays
+    after_peak = displacement > PEAK_DISPLACEMENT
+    load[after_peak] = peak_load - 5.0 * (displacement[after_peak] - PEAK_DISPLACEMENT)
+    failed = displacement > FAILURE_DISPLACEMENT
+    residual = peak_load * (1 - FAILURE_LOSS)
+    load[failed] = residual * np.exp(-(displacement[failed] - FAILURE_DISPLACEMENT) / 0.2)
+    return load
+
+
+def write_test_file(file_path, rows, delimiter='\t', chunk_rows=1_000_000, seed=0):
+    """Write a synthetic test log with `rows` data lines in the layout process_file expects."""
+    rng = np.random.default_rng(seed)
+    max_displacement = FAILURE_DISPLACEMENT * 1.25
+    with open(file_path, 'w') as file:
+        file.writelines(HEADER)
+        for start in range(0, rows, chunk_rows):
+            index = np.arange(start, min(start + chunk_rows, rows))
+            time = index * 0.01
+            displacement = index * (max_displacement / max(rows - 1, 1))
+            load = load_curve(displacement) + rng.normal(0, LOAD_NOISE, len(index))
+            displacement = displacement + DISPLACEMENT_OFFSET + rng.normal(0, DISPLACEMENT_NOISE, len(index))
+            chunk = pd.DataFrame({
+                'Points': index,
+                'Elapsed Time': time,
+                'Scan Time': time,
+                'Display 1': -displacement,
+                'Load 1': -load,
+                'Load 2': -load * 0.5 + rng.normal(0, LOAD_NOISE, len(index)),
+            })
+            lines = chunk.to_csv(sep=delimiter, header=False, index=False, float_format='%.6f').splitlines(True)
+            # Interleave "Axial Counts" lines at irregular positions
+            gaps = rng.integers(AXIAL_COUNTS_INTERVAL // 2, AXIAL_COUNTS_INTERVAL * 3 // 2, len(lines) // AXIAL_COUNTS_INTERVAL + 1)
+            positions = np.cumsum(gaps)
+            positions = positions[positions < len(lines)]
+            previous = 0
+            for position in positions:
+                file.writelines(lines[previous:position])
+                file.write(f"Axial Counts{delimiter}{start + position}{delimiter}0\n")
+                previous = position
+            file.writelines(lines[previous:])
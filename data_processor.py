@@ -1,17 +1,542 @@
+import io
+import mmap
 import os
+from dataclasses import dataclass, replace
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
+
+from instrumentation import profiler
+from parse_cache import file_fingerprint
+
+HEADER_LINES = 5
+AXIAL_COUNTS_PREFIX = "Axial Counts"
+COLUMNS = [
+    'Elapsed Time',
+    'Scan Time',
+    'Display 1',
+    'Load 1',
+    'Load 2',
+]
+
+STREAM_CHUNK_BYTES = 8 * 1024 * 1024
+FAILURE_COLUMN = 'Load 1'
+FAILURE_DROP = 1
+
+# Stiffness fit: the displacement window and the segments fitted inside it
+FIT_WINDOW = (0.01, 0.1)
+SEGMENT_RANGES = [
+    (0.01, 0.0325),
+    (0.0325, 0.055),
+    (0.055, 0.0775),
+    (0.0775, 0.1)
+]
+# Vertical distance from the stiffness line within which a sample counts as on it
+CONSENSUS_TOLERANCE = 0.05
+# Displacement the stiffness line is shifted by to find the yield point (offset method)
+YIELD_OFFSET = 0.01
+# DataProcessor attributes set_columns derives; AnalysisCache stores and restores them
+ANALYSIS_STATE = (
+    'x_values', 'y_values', 'original_df', 'max_index', 'max_slope', 'original_slope_point_one',
+    'original_slope_point_two', 'slope_point_indices', 'line_points', 'max_value', 'max_x',
+    'original_yield_displacement', 'original_yield_strength', 'sample_index', 'area_index',
+    'area_under_curve', 'area_to_peak', 'result',
+)
+
+
+@dataclass(frozen=True)
+class AnalysisConfig:
+    """Parameters of the stiffness fit and failure cut; hashable, so it is part of AnalysisCache keys.
+
+    failure_drop: a fall in load larger than this after the peak ends the curve.
+    fit_window: the (start, end) displacement range the stiffness is fitted in.
+    segment_ranges: the (start, end) ranges fitted separately; the steepest gives the stiffness.
+    consensus_tolerance: distance from the stiffness line within which a sample is on it.
+    yield_offset: displacement the stiffness line is shifted by to find the yield point.
+    """
+    failure_drop: float = FAILURE_DROP
+    fit_window: tuple = FIT_WINDOW
+    segment_ranges: tuple = tuple(SEGMENT_RANGES)
+    consensus_tolerance: float = CONSENSUS_TOLERANCE
+    yield_offset: float = YIELD_OFFSET
+
+    def __post_init__(self):
+        # Lists are accepted but stored as tuples to keep the config hashable
+        object.__setattr__(self, 'fit_window', tuple(self.fit_window))
+        object.__setattr__(self, 'segment_ranges', tuple(tuple(segment) for segment in self.segment_ranges))
+        if not self.fit_window[0] < self.fit_window[1]:
+            raise ValueError(f"Empty fit window {self.fit_window}")
+        if not self.segment_ranges:
+            raise ValueError("No segment ranges to fit")
+
+    def with_segments(self, count):
+        """Return a copy whose fit window is split into count equal segments."""
+        return replace(self, segment_ranges=equal_segments(self.fit_window, count))
+
+
+def equal_segments(window, count):
+    """Split the (start, end) window into count adjacent segments of equal width."""
+    # Rounded so the edges of the default split are exactly the literals of SEGMENT_RANGES
+    edges = [round(float(edge), 12) for edge in np.linspace(window[0], window[1], count + 1)]
+    return tuple(zip(edges[:-1], edges[1:]))
+
+
+def _tokens(text):
+    """Return the newline and "Axial Counts" prefix in the type of text (str or bytes)."""
+    if isinstance(text, str):
+        return '\n', AXIAL_COUNTS_PREFIX
+    return b'\n', AXIAL_COUNTS_PREFIX.encode()
+
+
+def _locate_data(text):
+    """Return the offset and line number of the first data line, skipping the header lines."""
+    newline, prefix = _tokens(text)
+    pos = 0
+    line_number = 0
+    skipped = 0
+    while pos < len(text) and (skipped < HEADER_LINES or text.startswith(prefix, pos)):
+        if not text.startswith(prefix, pos):
+            skipped += 1
+        end = text.find(newline, pos)
+        pos = len(text) if end == -1 else end + 1
+        line_number += 1
+    return pos, line_number
+
+
+def _axial_counts_rows(text, pos, line_number):
+    """Return the line numbers of the "Axial Counts" lines from the data offset on."""
+    newline, prefix = _tokens(text)
+    marker = newline + prefix
+    rows = [line_number] if text.startswith(prefix, pos) else []
+    last = pos
+    found = text.find(marker, pos)
+    while found != -1:
+        line_number += text.count(newline, last, found + 1)
+        last = found + 1
+        rows.append(line_number)
+        found = text.find(marker, last)
+    return rows
+
+
+def _detect_layout(line):
+    """Detect the delimiter and the positions of the value fields from one data line."""
+    delimiter = ',' if ',' in line else '\t'
+    fields = line.split(delimiter)
+    positions = [i for i, field in enumerate(fields) if field.strip()][1:1 + len(COLUMNS)]
+    return delimiter, positions
+
+
+def _read_values(text, delimiter, positions, skiprows):
+    """Decode the value fields with the pandas C tokenizer; None if the rows are irregular.
+
+    Every field up to the last value is read, so a row whose empty fields differ from
+    the detected layout (as the line-by-line parser would see it) is caught rather
+    than decoded from the wrong positions. Only the value fields are converted to
+    float; the leading fields are left to pandas, so a timestamp or label there is
+    read as text rather than failing the whole file.
+    """
+    if len(positions) != len(COLUMNS):
+        return None
+    try:
+        frame = pd.read_csv(
+            io.StringIO(text) if isinstance(text, str) else io.BytesIO(text),
+            sep=delimiter,
+            header=None,
+            skiprows=skiprows,
+            usecols=range(positions[-1] + 1),
+            dtype={position: np.float64 for position in positions},
+            skipinitialspace=True,
+            engine='c',
+        )
+    except pd.errors.EmptyDataError:
+        return np.empty((0, len(COLUMNS)))
+    except (ValueError, pd.errors.ParserError):
+        return None
+    # Empty fields read as missing; each row must hold one leading field, the values and nothing else
+    filled = frame.notna().to_numpy()
+    if (not filled[:, positions].all() or (filled[:, :positions[0]].sum(axis=1) != 1).any()
+            or (filled.sum(axis=1) != len(COLUMNS) + 1).any()):
+        return None
+    return frame[positions].to_numpy(dtype=np.float64)
+
+
+def parse_table(text):
+    """Decode the raw file text into a float64 array with one column per entry in COLUMNS.
+
+    The delimiter, header offset and field layout are detected once and the
+    "Axial Counts" lines are skipped by the pandas C tokenizer while it reads.
+    Files whose rows do not share a single layout fall back to the line-by-line parser.
+    """
+    pos, line_number = _locate_data(text)
+    end = text.find('\n', pos)
+    delimiter, positions = _detect_layout(text[pos:] if end == -1 else text[pos:end])
+    skiprows = list(range(line_number)) + _axial_counts_rows(text, pos, line_number)
+    table = _read_values(text, delimiter, positions, skiprows)
+    if table is not None:
+        return table
+    lines = [line for line in text[pos:].splitlines() if line[:12] != AXIAL_COUNTS_PREFIX]
+    return _parse_lines(lines, delimiter)
+
+
+def _parse_lines(lines, delimiter):
+    """Tokenize line by line, dropping empty fields the way the file format allows."""
+    clean_data = [[x.strip() for x in line.split(delimiter) if x.strip()][1:1 + len(COLUMNS)] for line in lines]
+    return np.array(clean_data, dtype=np.float64).reshape(-1, len(COLUMNS))
+
+
+def detect_data_layout(head):
+    """Return (offset of the first data line, delimiter, field positions) from the start of a file as bytes."""
+    pos, _ = _locate_data(head)
+    end = head.find(b'\n', pos)
+    delimiter, positions = _detect_layout(head[pos:end if end != -1 else len(head)].decode(errors='replace'))
+    return pos, delimiter, positions
+
+
+def parse_chunk(chunk, delimiter, positions):
+    """Decode whole data lines (bytes, "Axial Counts" lines allowed) into a float64 array."""
+    table = _read_values(chunk, delimiter, positions, _axial_counts_rows(chunk, 0, 0))
+    if table is None:
+        lines = [line for line in chunk.decode(errors='replace').splitlines() if line[:12] != AXIAL_COUNTS_PREFIX]
+        table = _parse_lines(lines, delimiter)
+    return table
+
+
+def iter_chunks(file_path, chunk_bytes=STREAM_CHUNK_BYTES, progress=None):
+    """Memory-map the file and yield its data section as float64 arrays of about chunk_bytes of text each.
+
+    progress, if given, is called as progress(bytes_done, bytes_total) after each chunk.
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # The header and the first data line are located in a small prefix of the file
+            pos, delimiter, positions = detect_data_layout(mapped[:min(len(mapped), 1024 * 1024)])
+            while pos < len(mapped):
+                # Cut each chunk at a line boundary so no row straddles two chunks
+                end = mapped.find(b'\n', min(pos + chunk_bytes, len(mapped)) - 1)
+                end = len(mapped) if end == -1 else end + 1
+                chunk = mapped[pos:end]
+                pos = end
+                table = parse_chunk(chunk, delimiter, positions)
+                if progress is not None:
+                    progress(pos, len(mapped))
+                yield table
+
+
+def stream_table(file_path, stop_at_failure=False, failure_column=FAILURE_COLUMN, chunk_bytes=STREAM_CHUNK_BYTES,
+                 progress=None, failure_drop=FAILURE_DROP):
+    """Parse a file chunk by chunk from a memory map, tracking the peak and failure as it goes.
+
+    The failure cut of process_data (the first drop of more than failure_drop after the
+    maximum of the sign-flipped failure_column) is maintained incrementally. With
+    stop_at_failure, decoding stops after the chunk where it is found; this matches the
+    full record unless the load later climbs back above the peak. Peak memory holds the
+    numeric chunks, never the whole raw text.
+    """
+    column = COLUMNS.index(failure_column)
+    chunks = []
+    rows = 0
+    peak_value = -np.inf
+    peak_row = None
+    cut_row = None
+    last_value = None
+    for table in iter_chunks(file_path, chunk_bytes, progress):
+        if len(table) == 0:
+            continue
+        chunks.append(table)
+        y = 0 - table[:, column]
+        chunk_peak = int(np.argmax(y))
+        if y[chunk_peak] > peak_value:
+            # A new maximum restarts the search for the drop after it
+            peak_value, peak_row = y[chunk_peak], rows + chunk_peak
+            cut_row = None
+            drops = np.flatnonzero(y[chunk_peak:-1] - y[chunk_peak + 1:] > failure_drop)
+            if len(drops):
+                cut_row = peak_row + 1 + int(drops[0])
+        elif cut_row is None:
+            drops = np.flatnonzero(np.diff(y, prepend=last_value) < -failure_drop)
+            if len(drops):
+                cut_row = rows + int(drops[0])
+        last_value = y[-1]
+        rows += len(table)
+        if stop_at_failure and cut_row is not None:
+            break
+    if not chunks:
+        return np.empty((0, len(COLUMNS)), order='F')
+    # Column-ordered like parse_table, so each column is one contiguous array
+    return np.concatenate(chunks, out=np.empty((rows, len(COLUMNS)), order='F'))
+
+
+def fit_segments(x, y, starts, ends):
+    """Least-squares fit y = slope * x + intercept on every [start, end] range of x at once.
+
+    x must be sorted ascending. The sums each fit needs are differences of prefix sums,
+    so any number of segments (overlapping or sliding windows included) costs two binary
+    searches per segment after one O(n) pass. Returns (slopes, intercepts, counts);
+    segments with fewer than two points have NaN slope and intercept.
+    """
+    starts = np.atleast_1d(np.asarray(starts, dtype=np.float64))
+    ends = np.atleast_1d(np.asarray(ends, dtype=np.float64))
+    lo = np.searchsorted(x, starts, side='left')
+    hi = np.searchsorted(x, ends, side='right')
+    counts = np.maximum(hi - lo, 0)
+    slopes = np.full(len(starts), np.nan)
+    intercepts = np.full(len(starts), np.nan)
+    if len(x) == 0:
+        return slopes, intercepts, counts
+
+    # Centre the data so the prefix-sum differences stay well conditioned
+    x_mean = x.mean()
+    y_mean = y.mean()
+    xc = x - x_mean
+    yc = y - y_mean
+    prefix = np.zeros((4, len(x) + 1))
+    np.cumsum(xc, out=prefix[0, 1:])
+    np.cumsum(yc, out=prefix[1, 1:])
+    np.cumsum(xc * xc, out=prefix[2, 1:])
+    np.cumsum(xc * yc, out=prefix[3, 1:])
+    sx, sy, sxx, sxy = prefix[:, hi] - prefix[:, lo]
+
+    fitted = counts >= 2
+    n = np.where(fitted, counts, 1)
+    var_x = sxx - sx * sx / n
+    cov_xy = sxy - sx * sy / n
+    # A segment with a single distinct x has no slope information; report a flat line
+    constant = fitted & (x[np.minimum(lo, len(x) - 1)] == x[np.maximum(hi - 1, 0)])
+    slopes = np.where(fitted, cov_xy / np.where(constant | ~fitted, 1, var_x), np.nan)
+    slopes[constant] = 0.0
+    intercepts = np.where(fitted, y_mean + sy / n - slopes * (x_mean + sx / n), np.nan)
+    return slopes, intercepts, counts
+
+
+def sliding_segments(start, stop, width, step):
+    """Return (starts, ends) of windows of the given width moved by step across [start, stop]."""
+    starts = np.arange(start, stop - width + step / 2, step)
+    return starts, starts + width
+
+
+def find_consensus_line(points, slope, tolerance):
+    """Find the offset of the line with the given slope that passes within tolerance of most points.
+
+    Equivalent to trying every point as the offset and counting residuals against all
+    points, but runs in O(n log n): the intercepts y - slope * x are sorted once and
+    each candidate counts its neighbours inside a window of width 2 * tolerance with
+    a binary search. Candidates whose window edges fall within rounding distance of
+    another intercept are recounted with the brute-force residual, so the first
+    best offset and its inlier mask are exactly those of the exhaustive search.
+    Returns (offset, mask), or (None, None) when there are no points.
+    """
+    if len(points) == 0:
+        return None, None
+    x = points[:, 0]
+    y = points[:, 1]
+    intercepts = y - slope * x
+    sorted_intercepts = np.sort(intercepts)
+
+    # Bracket each count between a slightly narrower and a slightly wider window
+    scale = np.max(np.abs(y)) + np.max(np.abs(slope * x)) + np.max(np.abs(intercepts))
+    margin = 8 * np.finfo(np.float64).eps * scale
+    low = (np.searchsorted(sorted_intercepts, intercepts + (tolerance - margin), side='left')
+           - np.searchsorted(sorted_intercepts, intercepts - (tolerance - margin), side='right'))
+    high = (np.searchsorted(sorted_intercepts, intercepts + (tolerance + margin), side='left')
+            - np.searchsorted(sorted_intercepts, intercepts - (tolerance + margin), side='right'))
+
+    counts = low
+    ambiguous = np.flatnonzero((low != high) & (high >= low.max()))
+    if len(ambiguous):
+        counts = low.copy()
+        for i in ambiguous:
+            counts[i] = np.sum(np.abs(y - (slope * x + intercepts[i])) < tolerance)
+
+    best = int(np.argmax(counts))
+    offset = intercepts[best]
+    return offset, np.abs(y - (slope * x + offset)) < tolerance
+
+
+def offset_yield_point(x, y, slope, intercept, offset, start=0):
+    """Return the (x, y) where the curve first falls below the stiffness line shifted by offset in x.
+
+    The curve is followed in sample order from start, where it lies on the stiffness
+    line and so above the shifted one. The crossing is the first sign change of the
+    distance to the shifted line, found in one vectorized pass, and is interpolated
+    linearly between the two samples around it. Returns None if the curve never crosses.
+    """
+    x = np.asarray(x[start:], dtype=np.float64)
+    y = np.asarray(y[start:], dtype=np.float64)
+    distance = y - (slope * (x - offset) + intercept)
+    crossings = np.flatnonzero((distance[:-1] > 0) & (distance[1:] <= 0))
+    if len(crossings) == 0:
+        return None
+    i = int(crossings[0])
+    t = distance[i] / (distance[i] - distance[i + 1])
+    return x[i] + t * (x[i + 1] - x[i]), y[i] + t * (y[i + 1] - y[i])
+
+
+class SampleIndex:
+    """Nearest-sample lookup over one curve, built once per set_columns.
+
+    The x values are sorted once with a stable sort, so a query is a binary search
+    even when displacement is not monotonic after failure, and equal x values keep
+    their sample order.
+    """
+
+    def __init__(self, x, y):
+        # Keeps the dtype of the data (float64, or float32 for compact specimens)
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.order = np.argsort(self.x, kind='stable')
+        if len(self.order) < 2 ** 31:
+            self.order = self.order.astype(np.int32)
+        self.sorted_x = self.x[self.order]
+        self.sorted_y = self.y[self.order]
+
+    def __len__(self):
+        return len(self.x)
+
+    def _first_sample(self, position):
+        """Return the earliest sample whose x equals sorted_x[position]."""
+        return int(self.order[np.searchsorted(self.sorted_x, self.sorted_x[position], side='left')])
+
+    def nearest(self, x):
+        """Return the index of the sample closest to x along the x axis.
+
+        Ties go to the earliest sample, matching (x_values - x).abs().idxmin().
+        """
+        position = int(np.searchsorted(self.sorted_x, x, side='left'))
+        best_index = None
+        best_distance = np.inf
+        for candidate in (position - 1, position):
+            if 0 <= candidate < len(self.sorted_x):
+                index = self._first_sample(candidate)
+                distance = abs(self.x[index] - x)
+                if distance < best_distance or (distance == best_distance and index < best_index):
+                    best_index, best_distance = index, distance
+        return best_index
+
+    def nearest_on_screen(self, x, y, x_scale, y_scale, block=64):
+        """Return the index of the sample closest to (x, y) in screen space.
+
+        x_scale and y_scale convert data units to pixels. The search widens outwards
+        from x in the sorted array and stops once the x gap alone exceeds the best
+        distance found, so it only visits the neighbourhood of the cursor.
+        """
+        count = len(self.sorted_x)
+        low = high = int(np.searchsorted(self.sorted_x, x, side='left'))
+        best_index = None
+        best_distance = np.inf
+        while low > 0 or high < count:
+            new_low = max(0, low - block)
+            new_high = min(count, high + block)
+            candidates = np.r_[new_low:low, high:new_high]
+            distances = (((self.sorted_x[candidates] - x) * x_scale) ** 2
+                         + ((self.sorted_y[candidates] - y) * y_scale) ** 2)
+            distance = distances.min()
+            index = int(self.order[candidates[distances == distance]].min())
+            if distance < best_distance or (distance == best_distance and index < best_index):
+                best_index, best_distance = index, distance
+            low, high = new_low, new_high
+
+            gap = np.inf
+            if low > 0:
+                gap = (x - self.sorted_x[low - 1]) * x_scale
+            if high < count:
+                gap = min(gap, (self.sorted_x[high] - x) * x_scale)
+            if gap * gap > best_distance:
+                break
+            block *= 2
+        return best_index
+
+
+class AreaIndex:
+    """Cumulative trapezoid area under one curve, built once per set_columns.
+
+    Samples sharing an x value are averaged first (the same reduction as a groupby
+    mean), then the running sum of trapezoids is stored per distinct x, so the area
+    between any two x values is two lookups plus a partial trapezoid at each end.
+    """
+
+    def __init__(self, sorted_x, sorted_y):
+        # Takes the x-sorted samples of a SampleIndex; NaN x values sort last and are dropped
+        valid = len(sorted_x) - int(np.count_nonzero(np.isnan(sorted_x)))
+        sorted_x, sorted_y = sorted_x[:valid], sorted_y[:valid]
+        starts = np.flatnonzero(np.r_[True, sorted_x[1:] != sorted_x[:-1]])
+        if len(starts) == valid:
+            # No repeated x values: share the sorted arrays instead of copying them
+            self.x, self.y = sorted_x, sorted_y
+        else:
+            groups = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, valid]))
+            self.x = sorted_x[starts]
+            self.y = np.bincount(groups, weights=sorted_y, minlength=len(starts)) / np.bincount(groups, minlength=len(starts))
+        # Accumulate in float64 whatever the dtype of the samples
+        x = self.x.astype(np.float64, copy=False)
+        y = self.y.astype(np.float64, copy=False)
+        self.cumulative = np.r_[0.0, np.cumsum(np.diff(x) * (y[1:] + y[:-1]) / 2)]
+
+    @property
+    def total(self):
+        return float(self.cumulative[-1]) if len(self.cumulative) else 0.0
+
+    def area_to(self, x):
+        """Return the area from the first x value up to x, clamped to the curve's x range."""
+        if len(self.x) < 2:
+            return 0.0
+        x = min(max(x, float(self.x[0])), float(self.x[-1]))
+        position = min(int(np.searchsorted(self.x, x, side='right')) - 1, len(self.x) - 2)
+        x0, x1 = float(self.x[position]), float(self.x[position + 1])
+        y0, y1 = float(self.y[position]), float(self.y[position + 1])
+        y = y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+        return float(self.cumulative[position] + (x - x0) * (y0 + y) / 2)
+
+    def area(self, x_a, x_b):
+        """Return the signed area between x_a and x_b."""
+        return self.area_to(x_b) - self.area_to(x_a)
+
+
+class AnalysisResult:
+    """Scalar outputs of DataProcessor.set_columns for one pair of axes."""
+    __slots__ = ('x_col', 'y_col', 'max_index', 'max_value', 'max_x', 'max_slope', 'line_points',
+                 'slope_point_one', 'slope_point_two', 'slope_point_indices', 'yield_displacement',
+                 'yield_strength', 'area_under_curve', 'area_to_peak')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def buffer_bytes(arrays):
+    """Return the bytes of the distinct buffers behind arrays, counting views of one buffer once."""
+    buffers = {}
+    for array in arrays:
+        if array is None:
+            continue
+        while isinstance(array.base, np.ndarray):
+            array = array.base
+        buffers[id(array)] = array.nbytes
+    return sum(buffers.values())
+
 
 class DataProcessor:
-    def __init__(self, file_path=None):
-        self.raw_data = None
+    def __init__(self, file_path=None, config=None, **options):
+        # Parameters of the analysis; an AnalysisConfig with the module defaults unless given
+        self.config = AnalysisConfig() if config is None else config
+        self.table = None
+        self.x_values = None
+        self.y_values = None
         self.original_df = None
-        self.df_for_area_calculation = None
+        self.result = None
+        self.area_index = None
+        self.file_path = None
         self.folder_path = None
         self.file_name = None
         self.line_points = None
         self.columns = None
+        self.specimen_key = None
+        self.sample_index = None
+        self.max_index = None
+        self.slope_point_indices = None
 
         self.max_slope = None
         self.original_slope_point_one = None
@@ -23,13 +548,16 @@ class DataProcessor:
         self.max_value = None
         self.max_x = None
         self.area_under_curve = None
+        self.area_to_peak = None
+        self.area_to_yield = None
+        self.area_between_points = None
         self.original_yield_displacement = None
         self.original_yield_strength = None
         self.yield_displacement = None
         self.yield_strength = None
 
         if file_path:
-            self.process_file(file_path)
+            self.process_file(file_path, **options)
 
     def reset_data(self):
         self.custom_slope = self.max_slope
@@ -53,129 +581,264 @@ class DataProcessor:
         x2, y2 = self.custom_slope_point_two
         self.custom_slope = (y2 - y1) / (x2 - x1)
 
-    def process_file(self, file_path):
-        """Process the text file and create a DataFrame."""
+    def mechanical_properties(self):
+        """Return the values exported to mechanical property.csv for this specimen."""
+        return {
+            'file name': self.file_name,
+            'slope': self.custom_slope,
+            'area': self.area_under_curve,
+            'yield displacement': self.yield_displacement,
+            'yield strength': self.yield_strength,
+            'max strength': self.max_value,
+        }
+
+    def process_file(self, file_path, streaming=False, stop_at_failure=False, progress=None, cache=None,
+                     float32=False, failure_column=FAILURE_COLUMN):
+        """Process the text file into an immutable numeric table with contiguous columns.
+
+        The raw text is released as soon as it is parsed. float32 halves the table and
+        everything derived from it; the fits and areas are still accumulated in float64.
+
+        With streaming the file is memory-mapped and decoded in chunks instead of being
+        read into memory as text; stop_at_failure additionally stops decoding once the
+        failure drop (of config.failure_drop) in failure_column, the y axis that will be analysed,
+        has been seen. progress is passed on to iter_chunks when streaming. With a ParseCache as cache, a file parsed before is
+        memory-mapped from its .npy entry instead, and a parsed file is added to it.
+        """
         try:
-            # Read and clean data
-            with open(file_path, 'r') as file:
-                self.raw_data = file.readlines()
+            self.file_path = file_path
             self.folder_path = os.path.dirname(file_path)
             self.file_name = os.path.basename(file_path).split('.')[0]
-            
-            self.raw_data = [line for line in self.raw_data if line[:12] != "Axial Counts"][5:]
-            self.columns = [
-                'Elapsed Time',
-                'Scan Time',
-                'Display 1',
-                'Load 1',
-                'Load 2',
-            ]
+            self.columns = list(COLUMNS)
+
+            # Parse once per file; column selection only derives views of this table
+            fingerprint = file_fingerprint(file_path)
+            entry_path = None
+            table = None
+            if cache is not None and not stop_at_failure:
+                with profiler.stage("cache lookup"):
+                    entry_path = cache.entry_path(file_path, fingerprint)
+                    table = cache.load(entry_path)
+            if table is not None:
+                self.table = table
+            elif streaming:
+                with profiler.stage("read + parse (streamed)"):
+                    self.table = stream_table(file_path, stop_at_failure, failure_column, progress=progress,
+                                              failure_drop=self.config.failure_drop)
+            else:
+                # Read the raw text; header and "Axial Counts" lines are skipped when parsing
+                with profiler.stage("read"):
+                    with open(file_path, 'r') as file:
+                        raw_data = file.read()
+                with profiler.stage("parse"):
+                    self.table = parse_table(raw_data)
+                del raw_data
+            # Skip caching a file that was written to while it was parsed
+            unchanged = table is not None or file_fingerprint(file_path) == fingerprint
+            if table is None and entry_path is not None and unchanged:
+                with profiler.stage("cache store"):
+                    cache.store(file_path, entry_path, self.table)
+            if float32:
+                self.table = self.table.astype(np.float32, order='F')
+            else:
+                self.table = np.asfortranarray(self.table)
+            self.table.flags.writeable = False
+            # Identifies the parsed content for AnalysisCache; None if it may not match the file
+            # (a table cut short at the failure depends on the column and drop it was cut at)
+            failure_cut = (failure_column, self.config.failure_drop) if stop_at_failure else None
+            self.specimen_key = (fingerprint, failure_cut, self.table.dtype.str) if unchanged else None
                 
         except Exception as e:
             raise Exception(f"Processing failed: {str(e)}")
         
+    def column(self, name):
+        """Return one column of the table as a contiguous read-only array."""
+        return self.table[:, self.columns.index(name)]
+
+    def axes(self, x_col, y_col):
+        """Return the sign-flipped x and y arrays of the chosen axes, x zeroed, before the failure cut."""
+        if x_col == y_col:
+            raise ValueError(f"X and Y axes are both {x_col}")
+        y = 0 - self.column(y_col)
+        x = 0 - self.column(x_col)
+        if x[0] > 0.005:
+            x -= x[0]
+        return x, y
+
     def process_data(self, x_col, y_col):
-        clean_data = [[x.strip() for x in line.split(',' if ',' in self.raw_data[0] else '\t') if x.strip()][1:6] for line in self.raw_data]
-        # Create DataFrame
-        self.original_df = pd.DataFrame(clean_data, columns=self.columns).astype(float)
-
-        self.original_df[y_col] = 0 - self.original_df[y_col]
-        self.original_df[x_col] = 0 - self.original_df[x_col]
-        if self.original_df[x_col][0] > 0.005:
-            self.original_df[x_col] = self.original_df[x_col] - self.original_df[x_col][0]
-        max_index = self.original_df[y_col].idxmax()
-        for i in range(max_index+1, len(self.original_df)):
-            if self.original_df[y_col][i-1] - self.original_df[y_col][i] > 1:
-                self.original_df = self.original_df.iloc[:i]
-                break
+        """Derive the sign-flipped, zeroed and failure-truncated x and y arrays for the chosen axes.
+
+        Only the two chosen columns are materialised; original_df is a two-column view of them.
+        """
+        x, y = self.axes(x_col, y_col)
+
+        # Cut at the first drop of more than failure_drop after the maximum
+        max_index = int(np.argmax(y))
+        drops = np.flatnonzero(y[max_index:-1] - y[max_index + 1:] > self.config.failure_drop)
+        if len(drops):
+            end = max_index + 1 + int(drops[0])
+            x, y = x[:end], y[:end]
+        self.x_values, self.y_values = x, y
+        self.original_df = pd.DataFrame({x_col: x, y_col: y}, copy=False)
         
-    def set_columns(self, x_col, y_col):
-        self.process_data(x_col, y_col)
-        max_index = self.original_df[y_col].idxmax()
-        self.calculate_max_slope(x_col, y_col)
-        self.custom_slope = self.max_slope
-        self.custom_slope_point_one, self.custom_slope_point_two = self.original_slope_point_one, self.original_slope_point_two
-        self.max_value = self.original_df[y_col].max()
-        self.max_x = self.original_df[x_col][max_index]
+    def analysis_key(self, x_col, y_col):
+        """Return the AnalysisCache key of analysing x_col against y_col, or None if it cannot be cached."""
+        if self.specimen_key is None:
+            return None
+        return self.specimen_key, x_col, y_col, self.config
 
-        min_x_idx = self.original_df[x_col].idxmin()
-        self.original_yield_displacement = self.original_df[x_col][min_x_idx]
-        self.original_yield_strength = self.original_df[y_col][min_x_idx]
-        self.yield_displacement = self.original_yield_displacement
-        self.yield_strength = self.original_yield_strength
+    def restore_analysis(self, x_col, y_col, cache):
+        """Take the analysis of x_col against y_col from cache; return False on a miss."""
+        key = self.analysis_key(x_col, y_col)
+        state = None if key is None else cache.get(key)
+        if state is None:
+            return False
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.reset_data()
+        self.calculate_partial_areas()
+        return True
+
+    def set_columns(self, x_col, y_col, cache=None):
+        """Analyse x_col against y_col; with an AnalysisCache as cache, reuse or store the results."""
+        if cache is not None and self.restore_analysis(x_col, y_col, cache):
+            return
+        with profiler.stage("analysis"):
+            with profiler.stage("truncate"):
+                self.process_data(x_col, y_col)
+            x, y = self.x_values, self.y_values
+            max_index = int(np.nanargmax(y))
+            self.max_index = max_index
+            with profiler.stage("max slope"):
+                self.calculate_max_slope(x_col, y_col)
+            self.custom_slope = self.max_slope
+            self.custom_slope_point_one, self.custom_slope_point_two = self.original_slope_point_one, self.original_slope_point_two
+            self.max_value = y[max_index]
+            self.max_x = x[max_index]
+
+            with profiler.stage("yield"):
+                self.calculate_yield_point()
+            self.yield_displacement = self.original_yield_displacement
+            self.yield_strength = self.original_yield_strength
+
+            with profiler.stage("sample index"):
+                self.sample_index = SampleIndex(x, y)
+            with profiler.stage("area"):
+                self.calculate_area_under_curve(x_col, y_col)
+            self.result = AnalysisResult(
+                x_col=x_col, y_col=y_col, max_index=self.max_index, max_value=self.max_value, max_x=self.max_x,
+                max_slope=self.max_slope, line_points=self.line_points,
+                slope_point_one=self.original_slope_point_one, slope_point_two=self.original_slope_point_two,
+                slope_point_indices=self.slope_point_indices,
+                yield_displacement=self.original_yield_displacement, yield_strength=self.original_yield_strength,
+                area_under_curve=self.area_under_curve, area_to_peak=self.area_to_peak)
+        key = self.analysis_key(x_col, y_col)
+        # An analysis without a stiffness line is an error for the window; it is not kept
+        if cache is not None and key is not None and self.line_points is not None:
+            cache.put(key, {name: getattr(self, name) for name in ANALYSIS_STATE})
+
+    def memory_report(self):
+        """Return the bytes held by this specimen, by part, with 'total' and the table's numeric size.
 
-        self.calculate_area_under_curve(x_col, y_col)
+        Arrays sharing a buffer are counted once; a memory-mapped table is counted at its
+        mapped size, though the operating system may page it out.
+        """
+        sample_index = self.sample_index
+        area_index = self.area_index
+        parts = {
+            'table': buffer_bytes([self.table]),
+            'axes': buffer_bytes([self.x_values, self.y_values]),
+            'sample index': 0 if sample_index is None else buffer_bytes(
+                [sample_index.order, sample_index.sorted_x, sample_index.sorted_y]),
+            'area index': 0 if area_index is None else buffer_bytes(
+                [area_index.x, area_index.y, area_index.cumulative]),
+        }
+        arrays = [self.table, self.x_values, self.y_values]
+        if sample_index is not None:
+            arrays += [sample_index.x, sample_index.y, sample_index.order, sample_index.sorted_x, sample_index.sorted_y]
+        if area_index is not None:
+            arrays += [area_index.x, area_index.y, area_index.cumulative]
+        report = dict(parts)
+        report['total'] = buffer_bytes(arrays)
+        report['numeric data'] = 0 if self.table is None else self.table.nbytes
+        return report
+
+    def key_sample_indices(self):
+        """Samples a reduced view of the curve must keep: the peak, the stiffness points and the failure drop."""
+        indices = [self.max_index, len(self.x_values) - 1]
+        if self.slope_point_indices is not None:
+            indices.extend(self.slope_point_indices)
+        return indices
 
     def calculate_area_under_curve(self, x_col, y_col):
-        """Calculate the area under the curve."""
-        self.df_for_area_calculation = self.original_df.groupby(x_col)[y_col].mean().reset_index().sort_values(x_col)
-        self.area_under_curve = np.trapz(self.df_for_area_calculation[y_col], self.df_for_area_calculation[x_col])
+        """Calculate the area under the curve and the energies up to the peak and the marked points."""
+        self.area_index = AreaIndex(self.sample_index.sorted_x, self.sample_index.sorted_y)
+        self.area_under_curve = self.area_index.total
+        self.area_to_peak = self.area_index.area_to(self.max_x)
+        self.calculate_partial_areas()
+
+    def calculate_partial_areas(self):
+        """Update the areas that follow the draggable yield and slope points."""
+        self.area_to_yield = self.area_index.area_to(self.yield_displacement)
+        if self.custom_slope_point_one is None or self.custom_slope_point_two is None:
+            self.area_between_points = None
+        else:
+            self.area_between_points = abs(self.area_index.area(self.custom_slope_point_one[0],
+                                                               self.custom_slope_point_two[0]))
         
+    def calculate_yield_point(self):
+        """Set the original yield point by the offset method, or to the smallest x if there is none."""
+        x, y = self.x_values, self.y_values
+        yield_point = None
+        if self.max_slope is not None and self.slope_point_indices is not None:
+            x1, y1 = self.original_slope_point_one
+            yield_point = offset_yield_point(x, y, self.max_slope, y1 - self.max_slope * x1,
+                                             self.config.yield_offset, start=self.slope_point_indices[0])
+        if yield_point is None:
+            # No crossing (or no stiffness line): start from the first sample to be placed by hand
+            min_x_idx = int(np.nanargmin(x))
+            yield_point = x[min_x_idx], y[min_x_idx]
+        self.original_yield_displacement, self.original_yield_strength = yield_point
+
     def calculate_max_slope(self, x_col, y_col):
         """Calculate maximum slope and find the line that passes through most points."""
-        # Filter data between 0.01 and 0.1
-        filtered_df = self.original_df[(self.original_df[x_col] < 0.1) & (self.original_df[x_col] > 0.01)].copy()
-        filtered_df = filtered_df.sort_values(x_col)
-        
-        # Define the ranges for segments
-        ranges = [
-            (0.01, 0.0325),
-            (0.0325, 0.055),
-            (0.055, 0.0775),
-            (0.0775, 0.1)
-        ]
+        # Nothing carries over from the axes analysed before if no segment can be fitted
+        self.max_slope = None
+        self.line_points = None
+        self.original_slope_point_one = self.original_slope_point_two = None
+        self.slope_point_indices = None
+        # Keep the data inside the fit window
+        window_start, window_end = self.config.fit_window
+        x_values = self.x_values
+        in_window = np.flatnonzero((x_values < window_end) & (x_values > window_start))
+        # Same sort as DataFrame.sort_values, on the window's sample indices only
+        window_indices = in_window[np.argsort(x_values[in_window], kind='quicksort')]
         
         # Step 1: Find max slope from linear regression of segments
-        max_slope = float('-inf')
-        for start, end in ranges:
-            segment = filtered_df[
-                (filtered_df[x_col] >= start) & 
-                (filtered_df[x_col] <= end)
-            ]
-            
-            if len(segment) < 2:
-                continue
-                
-            X = segment[x_col].values.reshape(-1, 1)
-            y = segment[y_col].values.reshape(-1, 1)
-            
-            reg = LinearRegression()
-            reg.fit(X, y)
-            
-            slope = reg.coef_[0][0]
-            if slope > max_slope:
-                max_slope = slope
+        x = x_values[window_indices].astype(np.float64, copy=False)
+        y = self.y_values[window_indices].astype(np.float64, copy=False)
+        starts, ends = np.array(self.config.segment_ranges).T
+        with profiler.stage("regression"):
+            slopes, _, counts = fit_segments(x, y, starts, ends)
+        fitted = counts >= 2
+        max_slope = slopes[fitted].max() if fitted.any() else float('-inf')
         
         if max_slope != float('-inf'):
             self.max_slope = max_slope
             
-            # Step 2: Try different offsets to find the one that passes through most points
-            all_points = filtered_df[[x_col, y_col]].values
-            best_offset = None
-            max_points_count = 0
-            points_on_best_line = None
-            
-            # Calculate all possible offsets
-            tolerance = 0.05
-            for point in all_points:
-                # Calculate offset if this point was on the line
-                offset = point[1] - max_slope * point[0]
-                
-                # Count points that would lie on this line
-                y_predicted = max_slope * all_points[:, 0] + offset
-                points_on_line = np.abs(all_points[:, 1] - y_predicted) < tolerance
-                points_count = np.sum(points_on_line)
-                
-                if points_count > max_points_count:
-                    max_points_count = points_count
-                    best_offset = offset
-                    points_on_best_line = points_on_line
+            # Step 2: Find the offset whose line passes through most points
+            all_points = np.column_stack([x, y])
+            tolerance = self.config.consensus_tolerance
+            with profiler.stage("consensus"):
+                best_offset, points_on_best_line = find_consensus_line(all_points, max_slope, tolerance)
             
             # Step 3: Get the min and max x-value points that lie on the line
             if points_on_best_line is not None:
                 line_points = all_points[points_on_best_line]
                 min_x_idx = np.argmin(line_points[:, 0])
                 max_x_idx = np.argmax(line_points[:, 0])
+                line_indices = window_indices[points_on_best_line]
+                self.slope_point_indices = (int(line_indices[min_x_idx]), int(line_indices[max_x_idx]))
                 
                 point1 = line_points[min_x_idx]  # (x1, y1)
                 point2 = line_points[max_x_idx]  # (x2, y2)
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def minmax_decimate(sample_index, x_min, x_max, columns, keep=()):
+    """Reduce the samples with x in [x_min, x_max] to the minimum and maximum y per pixel column.
+
+    sample_index is the SampleIndex of the curve; its sorted x array gives the visible
+    samples with two binary searches, so zooming in refines the view without touching
+    samples outside it. The first and last visible samples and the sample indices in
+    keep are always included exactly. Returns (x, y) of at most 2 * columns + 2 + len(keep)
+    samples.
+    """
+    sorted_x = sample_index.sorted_x
+    sorted_y = sample_index.sorted_y
+    low = int(np.searchsorted(sorted_x, x_min, side='left'))
+    high = int(np.searchsorted(sorted_x, x_max, side='right'))
+    count = high - low
+    keep = np.asarray(keep, dtype=np.intp)
+
+    if count <= 2 * columns + 2:
+        positions = np.arange(low, high)
+    else:
+        xs = sorted_x[low:high]
+        ys = sorted_y[low:high]
+        # x is sorted, so the pixel column of each sample is non-decreasing
+        bins = np.minimum(((xs - x_min) * (columns / (x_max - x_min))).astype(np.intp), columns - 1)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        bin_ids = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, count]))
+        lowest = _first_in_bin(ys == np.minimum.reduceat(ys, starts)[bin_ids], bin_ids)
+        highest = _first_in_bin(ys == np.maximum.reduceat(ys, starts)[bin_ids], bin_ids)
+        positions = low + np.unique(np.r_[0, lowest, highest, count - 1])
+
+    x = np.r_[sorted_x[positions], sample_index.x[keep]]
+    y = np.r_[sorted_y[positions], sample_index.y[keep]]
+    return x, y
+
+
+def _first_in_bin(mask, bin_ids):
+    """Return the first position per bin where mask is set."""
+    positions = np.flatnonzero(mask)
+    _, first = np.unique(bin_ids[positions], return_index=True)
+    return positions[first]
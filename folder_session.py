@@ -0,0 +1,200 @@
+"""Step through the test logs of a folder with the neighbours loaded ahead of time.
+
+A FolderSession keeps the position of the shown file among the .txt files of its
+folder. While a file is shown, the next PREFETCH_AHEAD files and the previous
+PREFETCH_BEHIND are parsed and analysed one at a time on a background thread, with
+the same AnalysisJob as a normal load, and kept in a bounded in-memory cache, so
+moving to a neighbour usually shows it without waiting. A file that is not ready yet
+is loaded first, ahead of the other prefetches, and reported when done.
+"""
+import copy
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
+
+from analysis_worker import AnalysisJob
+
+PREFETCH_AHEAD = 3
+PREFETCH_BEHIND = 1
+# Loaded specimens kept in memory; at least the prefetch window plus the shown file
+SESSION_CACHE_SIZE = 6
+
+
+def folder_test_files(folder_path):
+    """Return the .txt files directly in folder_path, sorted by name."""
+    try:
+        names = sorted(name for name in os.listdir(folder_path) if name.lower().endswith('.txt'))
+    except OSError:
+        return []
+    return [os.path.join(folder_path, name) for name in names]
+
+
+class FolderSession(QObject):
+    # percent done and stage of the file being waited for
+    progress = pyqtSignal(int, str)
+    # the file being waited for, analysed
+    ready = pyqtSignal(object)
+    # error message for the file being waited for
+    failed = pyqtSignal(str)
+
+    def __init__(self, folder_path, current_path, x_col, y_col, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        self.current_path = os.path.abspath(current_path)
+        self.x_col = x_col
+        self.y_col = y_col
+        self.files = folder_test_files(folder_path)
+        self.loaded = OrderedDict()
+        # file path -> error message of the loads that failed
+        self.failures = {}
+        # Files load one at a time, so the prefetches never compete with each other
+        # for memory and the waited-for file is always next
+        self.job = None
+        self.last_job_id = 0
+        self.waiting_for = None
+        self.pool = QThreadPool(self)
+
+    def position(self):
+        """Return the index of the shown file in the folder, or None if it is not in the listing."""
+        paths = [os.path.abspath(path) for path in self.files]
+        return paths.index(self.current_path) if self.current_path in paths else None
+
+    def neighbour(self, step):
+        """Return the file step places away from the shown one, or None past either end."""
+        position = self.position()
+        if position is None or not 0 <= position + step < len(self.files):
+            return None
+        return self.files[position + step]
+
+    def set_axes(self, x_col, y_col):
+        """Analyse later prefetches on these axes; loaded files keep theirs."""
+        self.x_col = x_col
+        self.y_col = y_col
+
+    def shown(self, file_path):
+        """Note that file_path is shown (however it was opened) and prefetch around it."""
+        self.current_path = os.path.abspath(file_path)
+        self.prefetch()
+
+    def move(self, step):
+        """Show the file step places away: emits ready at once if it is loaded, else once it is.
+
+        Returns the file path, or None if there is no file there.
+        """
+        # New logs may have been written since the listing
+        self.files = folder_test_files(self.folder_path)
+        file_path = self.neighbour(step)
+        if file_path is None:
+            return None
+        self.current_path = os.path.abspath(file_path)
+        processor = self.loaded.get(file_path)
+        if processor is not None:
+            self.loaded.move_to_end(file_path)
+            self.waiting_for = None
+            self.ready.emit(self.fresh_copy(processor))
+        else:
+            self.waiting_for = file_path
+            self.failures.pop(file_path, None)
+        self.prefetch()
+        return file_path
+
+    def stop_waiting(self):
+        """Stop reporting the waited-for file; it keeps loading as a prefetch."""
+        self.waiting_for = None
+
+    def fresh_copy(self, processor):
+        """Return a copy of a loaded processor with its points reset, so edits in the window stay local."""
+        processor = copy.copy(processor)
+        processor.reset_data()
+        processor.calculate_partial_areas()
+        return processor
+
+    def window(self):
+        """Return the files that should be loaded around the shown one, nearest first."""
+        wanted = []
+        for distance in range(1, max(PREFETCH_AHEAD, PREFETCH_BEHIND) + 1):
+            if distance <= PREFETCH_AHEAD:
+                wanted.append(self.neighbour(distance))
+            if distance <= PREFETCH_BEHIND:
+                wanted.append(self.neighbour(-distance))
+        return [path for path in wanted if path is not None]
+
+    def prefetch(self):
+        """Cancel a load that is no longer wanted first and start the next file to load, if any."""
+        if self.job is not None and self.job.file_path != self.waiting_for and (
+                self.waiting_for is not None or self.job.file_path not in self.window()):
+            # A prefetch gives way to the file the user is waiting for; it is restarted later
+            self.job.cancel()
+            self.job = None
+        self.schedule()
+
+    def schedule(self):
+        """Start loading the waited-for file, else the nearest file of the window not loaded yet."""
+        if self.job is not None:
+            return
+        candidates = ([self.waiting_for] if self.waiting_for is not None else []) + self.window()
+        for file_path in candidates:
+            if file_path not in self.loaded and file_path not in self.failures:
+                break
+        else:
+            return
+        self.last_job_id += 1
+        self.job = AnalysisJob(self.last_job_id, self.x_col, self.y_col, file_path)
+        self.job.signals.progress.connect(self.on_job_progress)
+        self.job.signals.finished.connect(self.on_job_finished)
+        self.job.signals.failed.connect(self.on_job_failed)
+        self.pool.start(self.job)
+
+    def store(self, file_path, processor):
+        """Keep a loaded processor, evicting the least recently used ones outside the window."""
+        self.loaded[file_path] = processor
+        self.loaded.move_to_end(file_path)
+        protected = set(self.window()) | {file_path}
+        for path in list(self.loaded):
+            if len(self.loaded) <= SESSION_CACHE_SIZE:
+                break
+            if path not in protected and os.path.abspath(path) != self.current_path:
+                del self.loaded[path]
+
+    def is_current(self, job_id):
+        return self.job is not None and self.job.job_id == job_id
+
+    @pyqtSlot(int, int, str)
+    def on_job_progress(self, job_id, percent, stage):
+        if self.is_current(job_id) and self.job.file_path == self.waiting_for:
+            self.progress.emit(percent, stage)
+
+    @pyqtSlot(int, object)
+    def on_job_finished(self, job_id, processor):
+        if not self.is_current(job_id):
+            return
+        file_path = self.job.file_path
+        self.job = None
+        self.store(file_path, processor)
+        if file_path == self.waiting_for:
+            self.waiting_for = None
+            self.ready.emit(self.fresh_copy(processor))
+        self.schedule()
+
+    @pyqtSlot(int, str)
+    def on_job_failed(self, job_id, message):
+        if not self.is_current(job_id):
+            return
+        file_path = self.job.file_path
+        self.job = None
+        # Not retried by the prefetch; stepping to the file tries it again
+        self.failures[file_path] = message
+        if file_path == self.waiting_for:
+            self.waiting_for = None
+            self.failed.emit(message)
+        self.schedule()
+
+    def close(self):
+        """Cancel the running load and wait for it to return."""
+        self.waiting_for = None
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.pool.waitForDone()
+        self.loaded.clear()
@@ -0,0 +1,148 @@
+"""Optional per-stage wall time and peak memory records for the analysis and the plot.
+
+Code marks its stages with ``with profiler.stage("parse"):``. While the profiler is
+disabled, stage() returns a shared no-op context manager, so an instrumented stage
+costs one method call. Enabled, each stage records its duration and, with
+track_memory, the peak traced allocation above what was allocated when it started
+(tracemalloc sees NumPy and pandas buffers too). Stages nest per thread; memory is
+traced process-wide, so a stage overlapping work on another thread includes that work's
+allocations. Records export as JSON or as a Chrome trace (chrome://tracing, Perfetto).
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+MAX_RECORDS = 10000
+_NO_STAGE = contextlib.nullcontext()
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start_memory = 0
+        self.child_peak = 0
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        if self.profiler.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stage's peak before resetting it for this one
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        stack = self.profiler._stack()
+        stack.pop()
+        peak_bytes = None
+        if self.profiler.track_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            peak_bytes = max(peak - self.start_memory, 0)
+        self.profiler.records.append({
+            'name': self.name,
+            'thread': threading.current_thread().name,
+            'thread_id': threading.get_ident(),
+            'depth': len(stack),
+            'start': self.start - self.profiler.origin,
+            'duration': end - self.start,
+            'peak_bytes': peak_bytes,
+        })
+        return False
+
+
+class Profiler:
+    def __init__(self, max_records=MAX_RECORDS):
+        self.enabled = False
+        self.track_memory = False
+        self.records = deque(maxlen=max_records)
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._started_tracing = False
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enable(self, track_memory=True):
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.track_memory = track_memory and tracemalloc.is_tracing()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.track_memory = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def clear(self):
+        self.records.clear()
+
+    def stage(self, name):
+        """Return a context manager that records the stage `name` while the profiler is enabled."""
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def latest(self):
+        """Return {stage name: its most recent record}, in the order the stages last started."""
+        latest = {}
+        for record in self.records:
+            latest.pop(record['name'], None)
+            latest[record['name']] = record
+        return dict(sorted(latest.items(), key=lambda item: item[1]['start']))
+
+    def summary(self, names=None):
+        """One line of 'stage time [peak]' for the latest record of each stage (or of `names`)."""
+        parts = []
+        for name, record in self.latest().items():
+            if names is not None and name not in names:
+                continue
+            part = f"{name} {record['duration'] * 1000:.1f} ms"
+            if record['peak_bytes'] is not None:
+                part += f" / {record['peak_bytes'] / 1e6:.1f} MB"
+            parts.append(part)
+        return " | ".join(parts)
+
+    def export_json(self, path):
+        with open(path, 'w') as file:
+            json.dump({'records': list(self.records)}, file, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Write the records as complete ('X') events of the Chrome trace event format."""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            event = {
+                'name': record['name'],
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['duration'] * 1e6,
+                'pid': pid,
+                'tid': record['thread_id'],
+                'args': {'thread': record['thread']},
+            }
+            if record['peak_bytes'] is not None:
+                event['args']['peak_bytes'] = record['peak_bytes']
+            events.append(event)
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+profiler = Profiler()
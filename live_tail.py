@@ -0,0 +1,162 @@
+import os
+import numpy as np
+from data_processor import COLUMNS, AnalysisConfig, SampleIndex, detect_data_layout, parse_chunk
+
+# Polls of the growing file, and so plot refreshes, happen at most this often
+LIVE_REFRESH_HZ = 4
+
+
+class LiveTail:
+    """Incrementally parsed view of a test log that is still being written.
+
+    Each poll reads only the bytes appended since the previous one and decodes the
+    complete lines among them. The peak, the area under the curve and the regression
+    sums of the stiffness segments are updated from the new samples alone, so a poll
+    costs time in proportion to what was appended, not to the whole record.
+
+    The failure cut is provisional, as in stream_table: samples after a drop keep being
+    read, and a later sample above the peak clears the cut and joins them to the curve.
+    """
+
+    def __init__(self, file_path, x_col='Display 1', y_col='Load 1', config=None):
+        self.file_path = file_path
+        # Failure drop, fit window and segments, as for DataProcessor
+        self.config = AnalysisConfig() if config is None else config
+        self.x_index = COLUMNS.index(x_col)
+        self.y_index = COLUMNS.index(y_col)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.layout = None
+        # Samples on the curve (before the failure cut) and samples read
+        self.count = 0
+        self.total = 0
+        self.cut = None
+        self._index = None
+        self._x = np.empty(4096)
+        self._y = np.empty(4096)
+        self.x_zero = None
+        self.peak_index = None
+        self.max_value = -np.inf
+        self.max_x = None
+        self.area_under_curve = 0.0
+        # Per segment: count, sum x, sum y, sum x*x, sum x*y (x measured from the segment start)
+        self.segment_sums = np.zeros((len(self.config.segment_ranges), 5))
+
+    @property
+    def x(self):
+        return self._x[:self.count]
+
+    @property
+    def y(self):
+        return self._y[:self.count]
+
+    @property
+    def failed(self):
+        """Whether the load has dropped past the failure threshold since the peak."""
+        return self.cut is not None
+
+    @property
+    def sample_index(self):
+        """SampleIndex of the curve, rebuilt only after the curve has grown."""
+        if self._index is None or len(self._index) != self.count:
+            self._index = SampleIndex(self.x, self.y)
+        return self._index
+
+    @property
+    def max_slope(self):
+        """Steepest segment regression slope so far, as in step 1 of calculate_max_slope."""
+        n, sx, sy, sxx, sxy = self.segment_sums.T
+        fitted = n >= 2
+        if not fitted.any():
+            return None
+        denominator = n * sxx - sx * sx
+        slopes = np.where(denominator[fitted] != 0,
+                          (n * sxy - sx * sy)[fitted] / np.where(denominator[fitted] != 0, denominator[fitted], 1), 0.0)
+        return float(slopes.max())
+
+    def poll(self):
+        """Parse the lines appended since the last poll; returns the number of samples added to the curve."""
+        with open(self.file_path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < self.offset:
+                # The log was truncated or replaced; start over
+                self.reset()
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        # Only complete lines; a partially written last line waits for the next poll
+        data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return 0
+        if self.layout is None:
+            pos, delimiter, positions = detect_data_layout(data)
+            if len(positions) != len(COLUMNS):
+                # The header or the first data line is not complete yet
+                return 0
+            self.layout = (delimiter, positions)
+            self.offset += pos
+            data = data[pos:]
+        self.offset += len(data)
+        table = parse_chunk(data, *self.layout)
+        return self.append(0 - table[:, self.x_index], 0 - table[:, self.y_index])
+
+    def append(self, x, y):
+        """Add sign-flipped samples and update the running results; returns how many joined the curve."""
+        if len(x) == 0:
+            return 0
+        if self.x_zero is None:
+            self.x_zero = x[0] if x[0] > 0.005 else 0.0
+        x = x - self.x_zero
+
+        start = self.total
+        if start + len(x) > len(self._x):
+            capacity = max(2 * len(self._x), start + len(x))
+            self._x = np.resize(self._x, capacity)
+            self._y = np.resize(self._y, capacity)
+        self._x[start:start + len(x)] = x
+        self._y[start:start + len(y)] = y
+        self.total += len(x)
+        self._track_failure(start)
+        return self._extend(self.total if self.cut is None else self.cut)
+
+    def _track_failure(self, start):
+        """Update the peak and the provisional cut from the samples read since start."""
+        y = self._y[start:self.total]
+        batch_peak = int(np.argmax(y))
+        if y[batch_peak] > self.max_value:
+            # A new maximum restarts the search for the drop after it
+            self.max_value = y[batch_peak]
+            self.max_x = self._x[start + batch_peak]
+            self.peak_index = start + batch_peak
+            self.cut = None
+            drops = np.flatnonzero(y[batch_peak:-1] - y[batch_peak + 1:] > self.config.failure_drop)
+            if len(drops):
+                self.cut = self.peak_index + 1 + int(drops[0])
+        elif self.cut is None:
+            drops = np.flatnonzero(np.diff(y, prepend=self._y[start - 1]) < -self.config.failure_drop)
+            if len(drops):
+                self.cut = start + int(drops[0])
+
+    def _extend(self, end):
+        """Add the samples up to end to the curve's area and segment sums; returns how many were added."""
+        if end <= self.count:
+            return 0
+        # Trapezoid sums are additive; the first new trapezoid joins the previous last sample
+        first = max(self.count - 1, 0)
+        xs = self._x[first:end]
+        ys = self._y[first:end]
+        self.area_under_curve += float(np.sum(np.diff(xs) * (ys[1:] + ys[:-1])) / 2)
+
+        x = self._x[self.count:end]
+        y = self._y[self.count:end]
+        window_start, window_end = self.config.fit_window
+        window = (x > window_start) & (x < window_end)
+        for k, (segment_start, segment_end) in enumerate(self.config.segment_ranges):
+            inside = window & (x >= segment_start) & (x <= segment_end)
+            xs = x[inside] - segment_start
+            ys = y[inside]
+            self.segment_sums[k] += (len(xs), xs.sum(), ys.sum(), (xs * xs).sum(), (xs * ys).sum())
+        added = end - self.count
+        self.count = end
+        return added
@@ -1,8 +1,23 @@
+import importlib
+import threading
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QLabel, 
-                           QPushButton, QFileDialog)
-from PyQt6.QtCore import Qt
-from data_processor import DataProcessor
-from plot_window import PlotWindow
+                           QPushButton, QFileDialog, QProgressBar)
+from PyQt6.QtCore import Qt, QTimer
+
+# Modules needed only once a file is chosen; imported lazily so the landing page
+# shows with just PyQt6 loaded
+HEAVY_MODULES = ("data_processor", "parse_cache", "analysis_worker", "plot_window")
+
+
+def warm_up_imports():
+    """Import the analysis and plotting modules in a background thread."""
+    def load():
+        for name in HEAVY_MODULES:
+            importlib.import_module(name)
+    thread = threading.Thread(target=load, name="warm-up-imports", daemon=True)
+    thread.start()
+    return thread
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -38,9 +53,23 @@ class MainWindow(QMainWindow):
             }
         """)
         self.upload_button.clicked.connect(self.upload_file)
+
+        # Progress of the file being loaded on the worker thread
+        self.progress_bar = QProgressBar(central_widget)
+        self.progress_bar.setGeometry(150, 240, 300, 25)
+        self.progress_bar.setVisible(False)
+        self.cancel_button = QPushButton("Cancel", central_widget)
+        self.cancel_button.setGeometry(250, 280, 100, 30)
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_upload)
+        self.analysis_runner = None
+
+        # Start loading pandas/matplotlib once the event loop is running
+        self.warm_up_thread = None
+        QTimer.singleShot(0, self.start_warm_up)
         
-        # Initialize data processor
-        self.data_processor = DataProcessor()
+        # The data processor is created once a file is chosen
+        self.data_processor = None
         self.file_path = None
         self.plot_window = None
         
@@ -52,7 +81,12 @@ class MainWindow(QMainWindow):
             }
         """)
 
+    def start_warm_up(self):
+        if self.warm_up_thread is None:
+            self.warm_up_thread = warm_up_imports()
+
     def upload_file(self):
+        self.start_warm_up()
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select Text File",
@@ -61,15 +95,59 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
-            try:
-                self.file_path = file_path
-                # Process data immediately
-                self.data_processor.process_file(self.file_path)
-                self.plot_window = PlotWindow(self.data_processor)  # Pass data_processor
-                self.plot_window.show()
-                
-                # Hide the main window
-                self.hide()
-                
-            except Exception as e:
-                self.status_label.setText(f"Error processing file: {str(e)}")
\ No newline at end of file
+            from analysis_worker import AnalysisRunner
+            from plot_window import X_COLUMN, Y_COLUMN
+
+            if self.analysis_runner is None:
+                self.analysis_runner = AnalysisRunner(self)
+                self.analysis_runner.progress.connect(self.on_upload_progress)
+                self.analysis_runner.finished.connect(self.on_upload_finished)
+                self.analysis_runner.failed.connect(self.on_upload_failed)
+            self.file_path = file_path
+            # Process the file on a worker thread; picking another file drops this one
+            self.analysis_runner.submit(X_COLUMN, Y_COLUMN, file_path=self.file_path)
+            self.status_label.setText("Loading file...")
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
+            self.cancel_button.setVisible(True)
+
+    def on_upload_progress(self, percent, stage):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage} %p%")
+
+    def on_upload_finished(self, data_processor):
+        from plot_window import PlotWindow
+
+        self.end_upload()
+        try:
+            plot_window = PlotWindow(data_processor)  # Pass data_processor
+        except Exception as e:
+            self.on_upload_failed(str(e))
+            return
+        self.status_label.setText("Please select a text file")
+        self.data_processor = data_processor
+        self.plot_window = plot_window
+        self.plot_window.show()
+
+        # Hide the main window
+        self.hide()
+
+    def on_upload_failed(self, message):
+        self.end_upload()
+        self.status_label.setText(f"Error processing file: {message}")
+
+    def cancel_upload(self):
+        self.analysis_runner.cancel()
+        self.end_upload()
+        self.status_label.setText("Please select a text file")
+
+    def end_upload(self):
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+
+    def closeEvent(self, event):
+        if self.analysis_runner is not None and self.analysis_runner.is_running():
+            # A file still loading is dropped; wait for its worker to return before exiting
+            self.analysis_runner.cancel()
+            self.analysis_runner.wait()
+        super().closeEvent(event)
\ No newline at end of file
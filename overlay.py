@@ -0,0 +1,105 @@
+"""Overlay of many analysed specimens on one matplotlib axes.
+
+Each specimen is reduced once, when it is loaded, to a min/max-decimated curve plus its
+peak and stiffness line. OverlayArtists draws all curves as one LineCollection, all
+stiffness lines as another and all peaks as one scatter. The collections hold only the
+visible specimens, re-decimated to the axes' pixel width for the visible x range, so
+hiding a specimen removes its cost from the next draw and zooming refines the curves
+from the stored reduction instead of reloading files.
+"""
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib import colormaps
+
+from data_processor import DataProcessor, SampleIndex
+from decimation import minmax_decimate
+from parse_cache import ParseCache
+
+# Pixel columns each curve is reduced to when loaded; zooming in refines down to these
+OVERLAY_COLUMNS = 2000
+# Screen pixels per min/max pair when drawing; overlaid curves do not need every pixel
+OVERLAY_PIXELS_PER_COLUMN = 2
+CURVE_ALPHA = 0.6
+
+
+class OverlayCurve:
+    """Decimated curve, peak and stiffness line of one specimen."""
+
+    def __init__(self, file_name, curve, peak, stiffness_line):
+        self.file_name = file_name
+        self.curve = curve
+        self.peak = peak
+        self.stiffness_line = stiffness_line
+
+
+def load_overlay_curve(file_path, x_col, y_col, columns=OVERLAY_COLUMNS):
+    """Analyse one file and reduce it to an OverlayCurve; runs in a worker process."""
+    processor = DataProcessor(file_path, streaming=True, cache=ParseCache())
+    processor.set_columns(x_col, y_col)
+    sample_index = processor.sample_index
+    x, y = minmax_decimate(sample_index, sample_index.sorted_x[0], sample_index.sorted_x[-1], columns)
+    stiffness_line = np.empty((0, 2)) if processor.line_points is None else np.array(processor.line_points, dtype=float)
+    return OverlayCurve(processor.file_name, np.column_stack([x, y]),
+                        (processor.max_x, processor.max_value), stiffness_line)
+
+
+class OverlayArtists:
+    def __init__(self, ax):
+        self.ax = ax
+        self.curves = []
+        self.sample_indices = []
+        # Curves decimated for the current view, filled in on demand
+        self.view_segments = []
+        self.visible = np.zeros(0, dtype=bool)
+        self.palette = colormaps['tab20']
+        self.curve_lines = LineCollection([], linewidths=1)
+        self.stiffness_lines = LineCollection([], linewidths=1.5, linestyles='--')
+        self.peaks = ax.scatter([], [], s=25, zorder=3)
+        ax.add_collection(self.curve_lines)
+        ax.add_collection(self.stiffness_lines)
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def colors(self):
+        colors = self.palette(np.arange(len(self.curves)) % self.palette.N)
+        colors[:, 3] = CURVE_ALPHA
+        return colors
+
+    def add(self, curves):
+        """Append loaded curves, visible, and grow the data limits by their bounds."""
+        if not curves:
+            return
+        self.curves.extend(curves)
+        self.sample_indices.extend(SampleIndex(curve.curve[:, 0], curve.curve[:, 1]) for curve in curves)
+        self.view_segments.extend([None] * len(curves))
+        self.visible = np.r_[self.visible, np.ones(len(curves), dtype=bool)]
+        for curve in curves:
+            self.ax.update_datalim(np.r_[curve.curve.min(axis=0, keepdims=True),
+                                         curve.curve.max(axis=0, keepdims=True)])
+        # autoscale_view fires xlim_changed, which refills the collections
+        self.ax.autoscale_view()
+        self.update_collections()
+
+    def set_visible(self, indices, visible):
+        self.visible[indices] = visible
+        self.update_collections()
+
+    def on_xlim_changed(self, ax):
+        self.view_segments = [None] * len(self.curves)
+        self.update_collections()
+
+    def update_collections(self):
+        """Give the collections the visible specimens only, decimated for the current view."""
+        shown = np.flatnonzero(self.visible)
+        x_min, x_max = sorted(self.ax.get_xlim())
+        columns = max(int(self.ax.bbox.width) // OVERLAY_PIXELS_PER_COLUMN, 1)
+        for i in shown:
+            if self.view_segments[i] is None:
+                self.view_segments[i] = np.column_stack(minmax_decimate(self.sample_indices[i], x_min, x_max, columns))
+        self.curve_lines.set_segments([self.view_segments[i] for i in shown])
+        self.stiffness_lines.set_segments([self.curves[i].stiffness_line for i in shown])
+        self.peaks.set_offsets(np.array([self.curves[i].peak for i in shown]).reshape(-1, 2))
+        colors = self.colors()[shown]
+        self.curve_lines.set_colors(colors)
+        self.stiffness_lines.set_colors(colors)
+        self.peaks.set_facecolors(colors)
+        self.peaks.set_edgecolors('none')
@@ -0,0 +1,174 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel,
+                           QListWidget, QListWidgetItem, QPushButton, QProgressBar)
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+from batch import find_test_files
+from overlay import OverlayArtists, load_overlay_curve
+
+# Loaded curves are added to the plot in batches at most this often
+OVERLAY_REFRESH_MS = 250
+
+
+class OverlayLoaderSignals(QObject):
+    # file index, OverlayCurve
+    loaded = pyqtSignal(int, object)
+    # file index, error message
+    failed = pyqtSignal(int, str)
+    done = pyqtSignal()
+
+
+class OverlayLoader(QRunnable):
+    """Analyse the files of a folder in a process pool and report each reduced curve."""
+
+    def __init__(self, file_paths, x_col, y_col):
+        super().__init__()
+        self.file_paths = file_paths
+        self.x_col = x_col
+        self.y_col = y_col
+        self.signals = OverlayLoaderSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        # Spawned, not forked: this process runs Qt and other threads whose locks a fork would copy
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {executor.submit(load_overlay_curve, file_path, self.x_col, self.y_col): index
+                       for index, file_path in enumerate(self.file_paths)}
+            for future in as_completed(futures):
+                if self.cancel_event.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                try:
+                    self.signals.loaded.emit(futures[future], future.result())
+                except Exception as e:
+                    self.signals.failed.emit(futures[future], str(e))
+        self.signals.done.emit()
+
+
+class OverlayWindow(QMainWindow):
+    def __init__(self, folder_path, x_col, y_col):
+        super().__init__()
+        self.setWindowTitle(f"Compare Specimens - {os.path.basename(folder_path)}")
+        self.resize(1200, 700)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QHBoxLayout(central_widget)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(20)
+
+        # Left panel: one checkable row per specimen
+        left_panel = QFrame()
+        left_panel.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Raised)
+        left_layout = QVBoxLayout(left_panel)
+        left_panel.setFixedWidth(250)
+        self.status_label = QLabel("")
+        left_layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        left_layout.addWidget(self.progress_bar)
+        self.specimen_list = QListWidget()
+        self.specimen_list.itemChanged.connect(self.on_item_changed)
+        left_layout.addWidget(self.specimen_list)
+        self.show_all_button = QPushButton("Show All")
+        self.show_all_button.clicked.connect(lambda: self.set_all_visible(True))
+        left_layout.addWidget(self.show_all_button)
+        self.hide_all_button = QPushButton("Hide All")
+        self.hide_all_button.clicked.connect(lambda: self.set_all_visible(False))
+        left_layout.addWidget(self.hide_all_button)
+
+        plot_panel = QFrame()
+        plot_layout = QVBoxLayout(plot_panel)
+        self.figure = Figure(figsize=(8, 6))
+        self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        plot_layout.addWidget(self.toolbar)
+        plot_layout.addWidget(self.canvas)
+        main_layout.addWidget(left_panel)
+        main_layout.addWidget(plot_panel, stretch=1)
+
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel(y_col, fontsize=12)
+        self.ax.set_ylabel(x_col, fontsize=12)
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.ax.spines['top'].set_visible(False)
+        self.ax.spines['right'].set_visible(False)
+        self.figure.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.1)
+        self.overlay = OverlayArtists(self.ax)
+
+        # Curves arrive in completion order; the list keeps them in the plot's order
+        self.file_paths = find_test_files(folder_path)
+        self.pending_curves = []
+        self.failures = 0
+        self.progress_bar.setRange(0, len(self.file_paths))
+        self.progress_bar.setValue(0)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(OVERLAY_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.add_pending_curves)
+        self.refresh_timer.start()
+        self.loader = OverlayLoader(self.file_paths, x_col, y_col)
+        self.loader.signals.loaded.connect(self.on_curve_loaded)
+        self.loader.signals.failed.connect(self.on_curve_failed)
+        self.loader.signals.done.connect(self.on_loading_done)
+        self.pool = QThreadPool(self)
+        self.pool.start(self.loader)
+
+    def on_curve_loaded(self, index, curve):
+        self.pending_curves.append(curve)
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def on_curve_failed(self, index, message):
+        self.failures += 1
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        print(f"Error message: {os.path.basename(self.file_paths[index])}: {message}")
+
+    def on_loading_done(self):
+        self.add_pending_curves()
+        self.refresh_timer.stop()
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(f"{len(self.overlay.curves)} specimens"
+                                  + (f", {self.failures} failed" if self.failures else ""))
+
+    def add_pending_curves(self):
+        if not self.pending_curves:
+            return
+        curves, self.pending_curves = self.pending_curves, []
+        self.specimen_list.blockSignals(True)
+        for offset, curve in enumerate(curves):
+            # Colour the name like its curve
+            red, green, blue, _ = self.overlay.palette((len(self.overlay.curves) + offset) % self.overlay.palette.N)
+            item = QListWidgetItem(curve.file_name)
+            item.setForeground(QColor.fromRgbF(red, green, blue))
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.specimen_list.addItem(item)
+        self.specimen_list.blockSignals(False)
+        self.overlay.add(curves)
+        self.toolbar.update()
+        self.canvas.draw_idle()
+
+    def on_item_changed(self, item):
+        self.overlay.set_visible(self.specimen_list.row(item), item.checkState() == Qt.CheckState.Checked)
+        self.canvas.draw_idle()
+
+    def set_all_visible(self, visible):
+        state = Qt.CheckState.Checked if visible else Qt.CheckState.Unchecked
+        self.specimen_list.blockSignals(True)
+        for row in range(self.specimen_list.count()):
+            self.specimen_list.item(row).setCheckState(state)
+        self.specimen_list.blockSignals(False)
+        self.overlay.set_visible(slice(None), visible)
+        self.canvas.draw_idle()
+
+    def closeEvent(self, event):
+        self.loader.cancel()
+        self.refresh_timer.stop()
+        super().closeEvent(event)
@@ -0,0 +1,188 @@
+"""Stiffness and failure cut of specimens over a grid of analysis parameters.
+
+Usage: python parameter_sweep.py PATH [PATH ...] [--failure-drops 0.5 1 2]
+       [--fit-windows 0.01:0.1 0.02:0.12] [--segments 2 4 8] [--output sweep.csv] [--workers N]
+
+PATH is a test log or a folder of them. Every combination of the given failure drops,
+fit windows and segment counts is evaluated; each specimen is parsed once and the whole
+grid is computed in one vectorized pass over it (see sweep_curve), and specimens run in
+a process pool like batch.py. The results match DataProcessor.set_columns with the same
+AnalysisConfig up to rounding.
+"""
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch import X_COLUMN, Y_COLUMN, find_test_files
+from data_processor import AnalysisConfig, DataProcessor
+
+
+def parameter_grid(failure_drops=None, fit_windows=None, segment_counts=None):
+    """Return an AnalysisConfig for every combination; fit windows are split into equal segments.
+
+    A parameter left as None keeps its default; without segment_counts the default
+    number of segments is used.
+    """
+    default = AnalysisConfig()
+    failure_drops = [default.failure_drop] if failure_drops is None else failure_drops
+    fit_windows = [default.fit_window] if fit_windows is None else fit_windows
+    segment_counts = [len(default.segment_ranges)] if segment_counts is None else segment_counts
+    return [AnalysisConfig(failure_drop=drop, fit_window=window).with_segments(count)
+            for drop, window, count in itertools.product(failure_drops, fit_windows, segment_counts)]
+
+
+def failure_cuts(y, failure_drops):
+    """Return the number of samples process_data keeps for each failure drop.
+
+    The cut is the first fall of more than the drop after the maximum, so with the
+    running maximum of the falls every threshold is one binary search.
+    """
+    max_index = int(np.argmax(y))
+    falls = y[max_index:-1] - y[max_index + 1:]
+    largest_fall = np.maximum.accumulate(falls) if len(falls) else falls
+    first = np.searchsorted(largest_fall, np.asarray(failure_drops, dtype=np.float64), side='right')
+    return np.where(first < len(falls), max_index + 1 + first, len(y))
+
+
+def sweep_curve(x, y, configs):
+    """Return {'rows', 'failure displacement', 'stiffness'} arrays for each config on one curve.
+
+    x and y are the sign-flipped, zeroed axes before the failure cut (DataProcessor.axes).
+    The samples inside any fit window are sorted by x once, and for each distinct cut
+    the sums of a least-squares fit are prefix sums over the samples before the cut, as
+    in fit_segments. Every segment of every config is then two binary searches and a
+    difference of those sums; the stiffness is the steepest fitted segment, NaN when no
+    segment has two samples.
+    """
+    drops = np.array([config.failure_drop for config in configs], dtype=np.float64)
+    unique_drops, drop_ids = np.unique(drops, return_inverse=True)
+    cuts = failure_cuts(y, unique_drops)
+    ends = cuts[drop_ids]
+
+    # Flatten the segments of all configs, each clipped to its config's open fit window
+    segments = [(i, *config.fit_window, start, end)
+                for i, config in enumerate(configs) for start, end in config.segment_ranges]
+    owner, window_start, window_end, segment_start, segment_end = np.array(segments, dtype=np.float64).T
+    owner = owner.astype(np.intp)
+
+    candidates = np.flatnonzero((x > window_start.min()) & (x < window_end.max()))
+    candidates = candidates[np.argsort(x[candidates], kind='stable')]
+    cx = x[candidates].astype(np.float64)
+    cy = y[candidates].astype(np.float64)
+    m = len(cx)
+
+    # Prefix sums of the centred samples, one row per distinct cut
+    kept = candidates[None, :] < cuts[:, None]
+    xc = cx - (cx.mean() if m else 0.0)
+    yc = cy - (cy.mean() if m else 0.0)
+    prefix = np.zeros((5, len(cuts), m + 1))
+    for row, values in enumerate((np.ones(m), xc, yc, xc * xc, xc * yc)):
+        np.cumsum(np.where(kept, values, 0.0), axis=1, out=prefix[row, :, 1:])
+    # First kept sample at or after j, and last kept sample before j, per cut
+    positions = np.broadcast_to(np.arange(m), kept.shape)
+    next_kept = np.minimum.accumulate(np.where(kept, positions, m)[:, ::-1], axis=1)[:, ::-1]
+    next_kept = np.concatenate([next_kept, np.full((len(cuts), 1), m)], axis=1)
+    last_kept = np.maximum.accumulate(np.where(kept, positions, -1), axis=1)
+    last_kept = np.concatenate([np.full((len(cuts), 1), -1), last_kept], axis=1)
+
+    lo = np.maximum(np.searchsorted(cx, segment_start, side='left'), np.searchsorted(cx, window_start, side='right'))
+    hi = np.minimum(np.searchsorted(cx, segment_end, side='right'), np.searchsorted(cx, window_end, side='left'))
+    hi = np.maximum(hi, lo)
+    cut = drop_ids[owner]
+    n, sx, sy, sxx, sxy = prefix[:, cut, hi] - prefix[:, cut, lo]
+    n = np.rint(n)
+
+    fitted = n >= 2
+    safe_n = np.where(fitted, n, 1)
+    var_x = sxx - sx * sx / safe_n
+    cov_xy = sxy - sx * sy / safe_n
+    # A segment with a single distinct x is a flat line, as in fit_segments
+    first = np.minimum(next_kept[cut, lo], max(m - 1, 0))
+    last = np.maximum(last_kept[cut, hi], 0)
+    constant = fitted & (cx[first] == cx[last]) if m else fitted
+    slopes = np.where(fitted & ~constant, cov_xy / np.where(fitted & ~constant, var_x, 1), 0.0)
+    slopes = np.where(fitted, slopes, -np.inf)
+
+    offsets = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+    stiffness = np.maximum.reduceat(slopes, offsets)
+    return {
+        'rows': ends,
+        'failure displacement': x[ends - 1] if len(x) else np.full(len(configs), np.nan),
+        'stiffness': np.where(np.isneginf(stiffness), np.nan, stiffness),
+    }
+
+
+def sweep_processor(processor, configs, x_col=X_COLUMN, y_col=Y_COLUMN):
+    """Return a DataFrame with one row per config for a loaded DataProcessor."""
+    x, y = processor.axes(x_col, y_col)
+    results = sweep_curve(x, y, configs)
+    return pd.DataFrame({
+        'file name': processor.file_name,
+        'failure drop': [config.failure_drop for config in configs],
+        'fit window start': [config.fit_window[0] for config in configs],
+        'fit window end': [config.fit_window[1] for config in configs],
+        'segments': [len(config.segment_ranges) for config in configs],
+        **results,
+    })
+
+
+def sweep_file(file_path, configs, x_col=X_COLUMN, y_col=Y_COLUMN):
+    """Parse one file and sweep it; returns (file_path, DataFrame, error)."""
+    try:
+        processor = DataProcessor(file_path, streaming=True)
+        return file_path, sweep_processor(processor, configs, x_col, y_col), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def sweep_files(file_paths, configs, workers=None, x_col=X_COLUMN, y_col=Y_COLUMN):
+    """Sweep every file in a process pool; returns (DataFrame of all results, {file path: error})."""
+    frames = []
+    failures = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(sweep_file, path, configs, x_col, y_col) for path in file_paths]
+        for future in futures:
+            file_path, frame, error = future.result()
+            if error is None:
+                frames.append(frame)
+            else:
+                failures[file_path] = error
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()), failures
+
+
+def parse_window(text):
+    start, end = text.split(':')
+    return float(start), float(end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate stiffness and failure cut over a grid of analysis parameters.")
+    parser.add_argument('paths', nargs='+', help="test logs or folders of them")
+    parser.add_argument('--failure-drops', nargs='+', type=float, help="load falls that end the curve")
+    parser.add_argument('--fit-windows', nargs='+', type=parse_window, help="fit windows as START:END")
+    parser.add_argument('--segments', nargs='+', type=int, help="numbers of equal segments per fit window")
+    parser.add_argument('--x-column', default=X_COLUMN)
+    parser.add_argument('--y-column', default=Y_COLUMN)
+    parser.add_argument('--output', default='parameter sweep.csv', help="CSV file to write")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    file_paths = []
+    for path in args.paths:
+        file_paths.extend(find_test_files(path) if os.path.isdir(path) else [path])
+    configs = parameter_grid(args.failure_drops, args.fit_windows, args.segments)
+    results, failures = sweep_files(file_paths, configs, args.workers, args.x_column, args.y_column)
+    results.to_csv(args.output, index=False)
+    print(f"{len(file_paths) - len(failures)} files x {len(configs)} parameter sets written to {args.output}")
+    for file_path, error in failures.items():
+        print(f"  {file_path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
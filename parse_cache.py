@@ -0,0 +1,104 @@
+"""Persistent cache of parsed test files as memory-mappable .npy tables.
+
+An entry is named after the source path and a fingerprint of its size, mtime and a
+sampled hash of its content, so an edited or rewritten file misses and is parsed again.
+Loading a hit maps the table read-only instead of parsing text. Entries are evicted
+least recently used first, by the cache file's mtime, once the directory holds more
+than max_bytes.
+"""
+import glob
+import hashlib
+import os
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "three_point_bending")
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+# The content hash reads the two ends of the file and SAMPLE_BLOCKS blocks in between
+SAMPLE_BLOCKS = 16
+SAMPLE_BYTES = 64 * 1024
+
+
+def content_hash(file_path, size):
+    """Hash the file's size, first and last SAMPLE_BYTES and SAMPLE_BLOCKS blocks spread over the rest."""
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file_path, 'rb') as file:
+        if size <= (SAMPLE_BLOCKS + 2) * SAMPLE_BYTES:
+            digest.update(file.read())
+        else:
+            offsets = np.linspace(0, size - SAMPLE_BYTES, SAMPLE_BLOCKS + 2).astype(np.int64)
+            for offset in offsets:
+                file.seek(int(offset))
+                digest.update(file.read(SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_path):
+    """Return a hex digest of the file's size, mtime and sampled content."""
+    stat = os.stat(file_path)
+    return hashlib.blake2b(
+        f"{stat.st_size}:{stat.st_mtime_ns}:{content_hash(file_path, stat.st_size)}".encode(),
+        digest_size=16).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path_key(self, file_path):
+        return hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=8).hexdigest()
+
+    def entry_path(self, file_path, fingerprint=None):
+        """Return the cache file for the current content of file_path (or for its given fingerprint)."""
+        if fingerprint is None:
+            fingerprint = file_fingerprint(file_path)
+        return os.path.join(self.directory, f"{self._path_key(file_path)}-{fingerprint}.npy")
+
+    def load(self, entry_path):
+        """Return the cached table memory-mapped read-only, or None on a miss."""
+        try:
+            table = np.load(entry_path, mmap_mode='r')
+            # Mark the entry as recently used
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return table
+
+    def store(self, file_path, entry_path, table):
+        """Write table for file_path, replacing older entries of the same path; failures are ignored."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                np.save(file, table)
+            os.replace(temp_path, entry_path)
+            for stale in glob.glob(os.path.join(self.directory, f"{self._path_key(file_path)}-*.npy")):
+                if stale != entry_path:
+                    os.remove(stale)
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.npy")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.directory, "*.npy")):
+            os.remove(path)
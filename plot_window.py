@@ -1,11 +1,27 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                           QComboBox, QLabel, QHBoxLayout, QFrame, QPushButton, QFileDialog)
-from PyQt6.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+                           QComboBox, QLabel, QHBoxLayout, QFrame, QPushButton, QFileDialog,
+                           QCheckBox, QProgressBar)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
-from data_processor import DataProcessor
-import pandas as pd
-import os
+from analysis_cache import analysis_cache
+from analysis_worker import AnalysisRunner
+from folder_session import FolderSession
+from analysis_plot import AnalysisPlot
+from decimation import minmax_decimate
+from results_store import open_results_store, results_store_path
+from live_tail import LIVE_REFRESH_HZ, LiveTail
+from instrumentation import profiler
+from collections import deque
+import numpy as np
+import copy
+import time
+
+# Axes shown when a file is first opened
+X_COLUMN = "Display 1"
+Y_COLUMN = "Load 1"
 
 class PlotWindow(QMainWindow):
     def __init__(self, data_processor):
@@ -47,13 +63,22 @@ class PlotWindow(QMainWindow):
         
         # Add column names to dropdowns
         self.populate_dropdowns()
-        self.x_combo.currentTextChanged.connect(self.update_plot)
-        self.y_combo.currentTextChanged.connect(self.update_plot)
+        self.x_combo.currentTextChanged.connect(self.analyse_axes)
+        self.y_combo.currentTextChanged.connect(self.analyse_axes)
         left_layout.addWidget(self.x_label)
         left_layout.addWidget(self.x_combo)
         left_layout.addWidget(self.y_label)
         left_layout.addWidget(self.y_combo)
 
+        # Snap dragged points to the nearest sample on screen instead of along x only
+        self.screen_snap_checkbox = QCheckBox("Snap in screen space")
+        left_layout.addWidget(self.screen_snap_checkbox)
+
+        # Record time and peak memory per stage; shown in the status bar
+        self.profile_checkbox = QCheckBox("Profile stages")
+        self.profile_checkbox.setChecked(profiler.enabled)
+        self.profile_checkbox.toggled.connect(self.set_profiling)
+        left_layout.addWidget(self.profile_checkbox)
 
         # Add file selection button
         self.file_button = QPushButton("Select Another File")
@@ -77,6 +102,89 @@ class PlotWindow(QMainWindow):
         self.file_button.clicked.connect(self.select_file)
         left_layout.addWidget(self.file_button)
 
+        # Step through the files of the shown file's folder; neighbours are loaded ahead
+        navigation_layout = QHBoxLayout()
+        navigation_layout.setSpacing(10)
+        self.previous_button = QPushButton("◀ Previous")
+        self.next_button = QPushButton("Next ▶")
+        for button, step in ((self.previous_button, -1), (self.next_button, 1)):
+            button.setFixedHeight(40)
+            button.setStyleSheet("""
+                QPushButton {
+                    background-color: #007BFF;
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    font-size: 14px;
+                    padding: 10px;
+                }
+                QPushButton:hover {
+                    background-color: #0056b3;
+                }
+                QPushButton:pressed {
+                    background-color: #004085;
+                }
+                QPushButton:disabled {
+                    background-color: #A0C4F0;
+                }
+            """)
+            button.clicked.connect(lambda checked, step=step: self.show_neighbour(step))
+            navigation_layout.addWidget(button)
+        left_layout.addLayout(navigation_layout)
+        self.folder_session = None
+        QShortcut(QKeySequence(Qt.Key.Key_PageDown), self, activated=lambda: self.show_neighbour(1))
+        QShortcut(QKeySequence(Qt.Key.Key_PageUp), self, activated=lambda: self.show_neighbour(-1))
+
+        # Overlay every specimen of a folder on one plot
+        self.compare_button = QPushButton("Compare Folder")
+        self.compare_button.setFixedHeight(40)
+        self.compare_button.setStyleSheet("""
+            QPushButton {
+                background-color: #007BFF;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 14px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #0056b3;
+            }
+            QPushButton:pressed {
+                background-color: #004085;
+            }
+        """)
+        self.compare_button.clicked.connect(self.compare_folder)
+        left_layout.addWidget(self.compare_button)
+        self.overlay_window = None
+
+        # Follow a test that is still writing its log
+        self.live_button = QPushButton("Follow Live File")
+        self.live_button.setCheckable(True)
+        self.live_button.setFixedHeight(40)
+        self.live_button.setStyleSheet("""
+            QPushButton {
+                background-color: #007BFF;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 14px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #0056b3;
+            }
+            QPushButton:checked {
+                background-color: #C0392B;
+            }
+        """)
+        self.live_button.toggled.connect(self.set_live_mode)
+        left_layout.addWidget(self.live_button)
+        self.live_tail = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(int(1000 / LIVE_REFRESH_HZ))
+        self.live_timer.timeout.connect(self.update_live_plot)
+
         
         # Add reset button for interactive points
         self.reset_button = QPushButton("Reset Points")
@@ -122,6 +230,28 @@ class PlotWindow(QMainWindow):
         self.export_button.clicked.connect(self.export_to_csv)
         left_layout.addWidget(self.export_button)
         left_layout.addStretch()
+
+        # Loading and analysis run on a worker thread; the plot keeps showing the
+        # previous result until the new one is ready
+        self.analysis_runner = AnalysisRunner(self)
+        self.analysis_runner.progress.connect(self.on_analysis_progress)
+        self.analysis_runner.finished.connect(self.on_analysis_finished)
+        self.analysis_runner.failed.connect(self.on_analysis_failed)
+        self.pending_file_path = None
+        self.plotted_axes = None
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.setVisible(False)
+        left_layout.addWidget(self.progress_bar)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_analysis)
+        left_layout.addWidget(self.cancel_button)
+
+        # Frame-time counter for point dragging
+        self.frame_time_label = QLabel("Drag frame time: -")
+        self.frame_time_label.setStyleSheet("font-size: 11px; color: #777777;")
+        left_layout.addWidget(self.frame_time_label)
         
         # Create right panel for plot
         plot_panel = QFrame()
@@ -132,7 +262,21 @@ class PlotWindow(QMainWindow):
         # Create matplotlib figure
         self.figure = Figure(figsize=(8, 6))
         self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        plot_layout.addWidget(self.toolbar)
         plot_layout.addWidget(self.canvas)
+
+        # Dragging blits the interactive artists over a cached background; the
+        # mouse handlers are connected once for the lifetime of the window
+        self.selected_point = None
+        self.background = None
+        self.frame_times = deque(maxlen=500)
+        self.event_connections = [
+            self.canvas.mpl_connect('pick_event', self.on_pick),
+            self.canvas.mpl_connect('motion_notify_event', self.on_motion),
+            self.canvas.mpl_connect('button_release_event', self.on_release),
+            self.canvas.mpl_connect('draw_event', self.on_draw),
+        ]
         
         # Add panels to main layout
         main_layout.addWidget(left_panel)
@@ -221,8 +365,15 @@ class PlotWindow(QMainWindow):
             }
         """)
         
+        self.profile_export_button = QPushButton("Export Profile")
+        self.profile_export_button.clicked.connect(self.export_profile)
+        self.profile_export_button.setVisible(profiler.enabled)
+        self.statusBar().addPermanentWidget(self.profile_export_button)
+
         # Initial plot with fixed axes
+        self.build_plot()
         self.update_plot()
+        self.update_folder_session()
 
     def populate_dropdowns(self):
         columns = self.data_processor.columns
@@ -230,118 +381,140 @@ class PlotWindow(QMainWindow):
         self.y_combo.clear()
         self.x_combo.addItems(columns)
         self.y_combo.addItems(columns)
-        self.x_combo.setCurrentText("Display 1")
-        self.y_combo.setCurrentText("Load 1")
+        self.x_combo.setCurrentText(X_COLUMN)
+        self.y_combo.setCurrentText(Y_COLUMN)
         
-    def update_plot(self):
-        self.custom_slope_point_one_annotation = None
-        self.custom_slope_point_two_annotation = None
-        self.yield_point_annotation = None
-        self.slope_annotation = None
-        x_col = self.x_combo.currentText()
-        y_col = self.y_combo.currentText()
-        self.data_processor.set_columns(x_col, y_col)
-        # Use fixed column names instead of getting from dropdowns
-        self.figure.clear()
+    def build_plot(self):
+        """Create the axes and every artist once; update_plot only changes their data."""
         ax = self.figure.add_subplot(111)
-        # Create scatter plot with smaller data points
-        ax.scatter(self.data_processor.original_df[x_col], self.data_processor.original_df[y_col], alpha=0.5, color='#1f77b4', s=10)
-        # Highlight the max point in Load 1
-        max_value = self.data_processor.max_value
-        max_x = self.data_processor.max_x
-        ax.scatter(max_x, max_value, color='red', s=100, label='Maximum Strength')
-        # Add max point annotation
-        ax.annotate(f'({max_x}, {max_value})',
-                    xy=(max_x, max_value),
-                    xytext=(10, 10),
-                    textcoords='offset points',
-                    color='red')
-        (x1, y1), (x2, y2) = self.data_processor.line_points
-        ax.plot([x1, x2], [y1, y2], color='purple', linewidth=2, 
-                label=f'Stiffness')
-        # Get the actual points for interactive points initialization
-        (px1, py1), (px2, py2) = self.data_processor.custom_slope_point_one, self.data_processor.custom_slope_point_two
-        # Get point with minimum x value for third point initialization
-        min_x = self.data_processor.yield_displacement
-        min_y = self.data_processor.yield_strength
-        # Add interactive points
-        self.interactive_points = [
-            ax.scatter(px1, py1, color='blue', s=100, picker=True),
-            ax.scatter(px2, py2, color='blue', s=100, picker=True),
-            ax.scatter(min_x, min_y, color='green', s=100, picker=True, label='Yield Point')
-        ]
-        # Draw line between blue interactive points only
-        self.interactive_line, = ax.plot([px1, px2], [py1, py2], 'b--', linewidth=1)
-
-        # Add slope text boxes with better positioning and styling
-        ax.text(0.02, 0.98, 
-                f'Calculated Max Slope: {self.data_processor.max_slope:.4f}',
-                transform=ax.transAxes,
-                bbox=dict(
-                    facecolor='white',
-                    edgecolor='blue',
-                    alpha=0.8,
-                    boxstyle='round,pad=0.5'
-                ),
-                verticalalignment='top',
-                color='blue',
-                fontsize=10)
-        
-        # Add area under curve text box
-        ax.text(0.02, 0.86,  # Position below the slope text boxes
-                f'Area: {self.data_processor.area_under_curve:.4f}',
-                transform=ax.transAxes,
-                bbox=dict(
-                    facecolor='white',
-                    edgecolor='blue',
-                    alpha=0.8,
-                    boxstyle='round,pad=0.5'
-                ),
-                verticalalignment='top',
-                horizontalalignment='left',
-                color='blue',
-                fontsize=10,
-                zorder=1000
+        self.ax = ax
+        self.analysis_plot = AnalysisPlot(ax)
+        plot = self.analysis_plot
+        self.data_scatter = plot.data_scatter
+        self.max_point = plot.max_point
+        self.max_point_annotation = plot.max_point_annotation
+        self.stiffness_line = plot.stiffness_line
+        self.interactive_points = plot.interactive_points
+        self.interactive_line = plot.interactive_line
+        self.custom_slope_point_one_annotation = plot.custom_slope_point_one_annotation
+        self.custom_slope_point_two_annotation = plot.custom_slope_point_two_annotation
+        self.yield_point_annotation = plot.yield_point_annotation
+        self.slope_annotation = plot.slope_annotation
+        self.max_slope_text = plot.max_slope_text
+        self.area_text = plot.area_text
+        self.partial_area_text = plot.partial_area_text
+        # Curve of a test followed live, shown instead of the analysed scatter
+        self.live_line, = ax.plot([], [], color='#1f77b4', linewidth=1, visible=False)
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def update_plot(self):
+        """Redraw the plot from the data processor, which is already analysed for the selected axes."""
+        with profiler.stage("plot"):
+            self.selected_point = None
+            self.background = None
+            x_col = self.x_combo.currentText()
+            y_col = self.y_combo.currentText()
+            self.plotted_axes = (x_col, y_col)
+            ax = self.ax
+
+            self.analysis_plot.show(self.data_processor, x_col, y_col)
+            # Fill the scatter for the new view and make it the toolbar's home view
+            with profiler.stage("decimate"):
+                self.on_xlim_changed(ax)
+            self.toolbar.update()
+            if profiler.enabled:
+                # Draw now so the stage covers rendering, not just scheduling it
+                with profiler.stage("draw"):
+                    self.canvas.draw()
+            else:
+                self.canvas.draw_idle()
+        self.show_profile()
+
+    def set_profiling(self, enabled):
+        if enabled:
+            profiler.clear()
+            profiler.enable()
+        else:
+            profiler.disable()
+            self.statusBar().clearMessage()
+        self.profile_export_button.setVisible(enabled)
+
+    def show_profile(self):
+        if profiler.enabled:
+            self.statusBar().showMessage(profiler.summary())
+
+    def export_profile(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Profile",
+            "profile.json",
+            "Chrome Trace (*.json);;Stage Records (*.json)"
         )
-        self.draw_custom_slope_point_one_annotation()
-        self.draw_custom_slope_point_two_annotation()
-        self.draw_yield_point_annotation()
-        self.draw_slope_annotation()
-        
-        self.selected_point = None
-        self.canvas.mpl_connect('pick_event', self.on_pick)
-        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
-        self.canvas.mpl_connect('button_release_event', self.on_release)
-        # Style the plot
-        ax.set_xlabel(y_col, fontsize=12)
-        ax.set_ylabel(x_col, fontsize=12)
-        ax.grid(True, linestyle='--', alpha=0.7)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.legend(loc='lower right')
-        
-        # Add some padding to the layout
-        self.figure.subplots_adjust(left=0.15, right=0.95, top=0.95, bottom=0.15)
-        self.canvas.draw()
-    
+        if file_path:
+            if selected_filter.startswith("Chrome"):
+                profiler.export_chrome_trace(file_path)
+            else:
+                profiler.export_json(file_path)
+
+    def on_xlim_changed(self, ax):
+        # Refine the reduced curve for the new view after a zoom or pan
+        if self.live_tail is not None:
+            self.draw_live_curve()
+        else:
+            self.analysis_plot.show_curve()
+
+    def interactive_artists(self):
+        """Artists redrawn while a point is dragged; everything else is the cached background."""
+        return [*self.interactive_points, self.interactive_line,
+                self.custom_slope_point_one_annotation, self.custom_slope_point_two_annotation,
+                self.yield_point_annotation, self.slope_annotation, self.partial_area_text]
+
     def on_pick(self, event):
+        if event.artist not in self.interactive_points:
+            return
         self.selected_point = event.artist
         self.press = event.mouseevent.xdata, event.mouseevent.ydata
+        # Render the static plot once without the interactive artists and cache it
+        for artist in self.interactive_artists():
+            artist.set_animated(True)
+        self.frame_times.clear()
+        self.canvas.draw()
+
+    def on_draw(self, event):
+        if self.selected_point is not None:
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self.draw_interactive_artists()
+
+    def draw_interactive_artists(self):
+        for artist in self.interactive_artists():
+            self.figure.draw_artist(artist)
+
+    def blit(self):
+        """Restore the cached background and redraw only the interactive artists."""
+        self.canvas.restore_region(self.background)
+        self.draw_interactive_artists()
+        self.canvas.blit(self.figure.bbox)
 
     def on_motion(self, event):
         if self.selected_point is not None and event.xdata is not None and event.ydata is not None:
-            # Find the closest x-value in the dataset
-            x_col = self.x_combo.currentText()
-            y_col = self.y_combo.currentText()
-            closest_index = (self.data_processor.original_df[x_col] - event.xdata).abs().idxmin()
-            closest_x = self.data_processor.original_df[x_col][closest_index]
-            closest_y = self.data_processor.original_df[y_col][closest_index]
+            frame_start = time.perf_counter()
+            # Find the closest sample with a binary search over the sorted x values
+            sample_index = self.data_processor.sample_index
+            ax = self.figure.gca()
+            if self.screen_snap_checkbox.isChecked():
+                x_min, x_max = ax.get_xlim()
+                y_min, y_max = ax.get_ylim()
+                closest_index = sample_index.nearest_on_screen(
+                    event.xdata, event.ydata,
+                    ax.bbox.width / abs(x_max - x_min),
+                    ax.bbox.height / abs(y_max - y_min))
+            else:
+                closest_index = sample_index.nearest(event.xdata)
+            closest_x = sample_index.x[closest_index]
+            closest_y = sample_index.y[closest_index]
             
             # Move the point to the closest data point
             self.selected_point.set_offsets([closest_x, closest_y])
-
-            # Get current axis
-            ax = self.figure.gca()
             
             point_index = self.interactive_points.index(self.selected_point)
             if point_index < 2:
@@ -358,11 +531,210 @@ class PlotWindow(QMainWindow):
             elif point_index == 2:
                 self.data_processor.set_yield_point(closest_x, closest_y)
                 self.draw_yield_point_annotation()
+            self.draw_partial_areas()
 
-            self.canvas.draw_idle()
+            if self.background is not None:
+                self.blit()
+            self.frame_times.append(time.perf_counter() - frame_start)
 
     def on_release(self, event):
+        if self.selected_point is None:
+            return
         self.selected_point = None
+        self.background = None
+        for artist in self.interactive_artists():
+            artist.set_animated(False)
+        self.canvas.draw_idle()
+        if self.frame_times:
+            frame_times = np.array(self.frame_times) * 1000
+            self.frame_time_label.setText(
+                f"Drag frame time: {frame_times.mean():.1f} ms avg, "
+                f"{frame_times.max():.1f} ms max ({len(frame_times)} frames)")
+
+    def start_analysis(self, file_path=None, processor=None):
+        """Analyse file_path, or processor (the current data by default) for the selected axes, on the worker thread."""
+        if file_path is not None:
+            self.pending_file_path = file_path
+        x_col = self.x_combo.currentText()
+        y_col = self.y_combo.currentText()
+        if self.pending_file_path is not None:
+            self.analysis_runner.submit(x_col, y_col, file_path=self.pending_file_path)
+        else:
+            # Axes analysed before are restored from the cache without a worker
+            source = self.data_processor if processor is None else processor
+            processor = copy.copy(source)
+            if processor.restore_analysis(x_col, y_col, analysis_cache):
+                self.analysis_runner.cancel()
+                self.on_analysis_finished(processor)
+                return
+            self.analysis_runner.submit(x_col, y_col, processor=source)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setVisible(True)
+
+    def analyse_axes(self):
+        if self.pending_file_path is None and self.plotted_axes == (self.x_combo.currentText(), self.y_combo.currentText()):
+            # Back to the plotted axes: the running job is no longer wanted
+            self.cancel_analysis()
+        else:
+            self.start_analysis()
+
+    def on_analysis_progress(self, percent, stage):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage} %p%")
+
+    def on_analysis_finished(self, data_processor):
+        self.end_analysis()
+        # Finish a drag on the old data before its artists are replaced
+        self.on_release(None)
+        self.pending_file_path = None
+        previous_processor, previous_axes = self.data_processor, self.plotted_axes
+        try:
+            self.data_processor = data_processor
+            self.file_label.setText(f"{self.data_processor.file_name}")
+            self.update_plot()
+        except Exception as e:
+            # Go back to the specimen and axes that were plotted before
+            self.data_processor, self.plotted_axes = previous_processor, previous_axes
+            self.file_label.setText(f"{self.data_processor.file_name}")
+            self.on_analysis_failed(str(e))
+            self.update_plot()
+            return
+        self.update_folder_session()
+
+    def update_folder_session(self):
+        """Follow the shown file's folder and prefetch the files around it."""
+        folder_path = self.data_processor.folder_path
+        if self.folder_session is None or self.folder_session.folder_path != folder_path:
+            if self.folder_session is not None:
+                self.folder_session.close()
+            self.folder_session = FolderSession(folder_path, self.data_processor.file_path, *self.plotted_axes, self)
+            self.folder_session.progress.connect(self.on_analysis_progress)
+            self.folder_session.ready.connect(self.on_neighbour_ready)
+            self.folder_session.failed.connect(self.on_analysis_failed)
+        self.folder_session.set_axes(*self.plotted_axes)
+        self.folder_session.shown(self.data_processor.file_path)
+        self.update_navigation_buttons()
+
+    def update_navigation_buttons(self):
+        live = self.live_button.isChecked()
+        self.previous_button.setEnabled(not live and self.folder_session.neighbour(-1) is not None)
+        self.next_button.setEnabled(not live and self.folder_session.neighbour(1) is not None)
+
+    def show_neighbour(self, step):
+        """Show the previous (step -1) or next (step 1) file of the folder session."""
+        if self.folder_session is None or self.live_button.isChecked():
+            return
+        # A file still loading from the dialog is superseded
+        self.analysis_runner.cancel()
+        self.pending_file_path = None
+        file_path = self.folder_session.move(step)
+        if file_path is not None and self.folder_session.waiting_for == file_path:
+            # Not prefetched yet: it is loaded first and shown by on_neighbour_ready
+            self.pending_file_path = file_path
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
+            self.cancel_button.setVisible(True)
+
+    def on_neighbour_ready(self, data_processor):
+        self.pending_file_path = None
+        result = data_processor.result
+        if result is not None and (result.x_col, result.y_col) == (self.x_combo.currentText(), self.y_combo.currentText()):
+            self.on_analysis_finished(data_processor)
+        else:
+            # Prefetched on other axes than the ones now selected
+            self.start_analysis(processor=data_processor)
+
+    def on_analysis_failed(self, message):
+        print(f"Error message: {message}")
+        self.cancel_analysis()
+
+    def cancel_analysis(self):
+        """Drop the running job and go back to the axes that are plotted."""
+        self.analysis_runner.cancel()
+        if self.folder_session is not None:
+            # A file that was being stepped to is dropped; the session stays on the shown one
+            self.folder_session.stop_waiting()
+            self.folder_session.shown(self.data_processor.file_path)
+            self.update_navigation_buttons()
+        self.pending_file_path = None
+        self.end_analysis()
+        for combo, column in zip((self.x_combo, self.y_combo), self.plotted_axes):
+            combo.blockSignals(True)
+            combo.setCurrentText(column)
+            combo.blockSignals(False)
+
+    def end_analysis(self):
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+
+    def closeEvent(self, event):
+        # Let a cancelled job return before the window and its data go away
+        self.analysis_runner.cancel()
+        self.analysis_runner.wait()
+        if self.folder_session is not None:
+            self.folder_session.close()
+        self.live_timer.stop()
+        for connection in self.event_connections:
+            self.canvas.mpl_disconnect(connection)
+        self.event_connections = []
+        super().closeEvent(event)
+
+    def analysis_artists(self):
+        """Artists of the full analysis, hidden while a test is followed live."""
+        return [self.data_scatter, self.stiffness_line, self.max_point_annotation,
+                *self.interactive_artists()]
+
+    def set_live_mode(self, live):
+        for widget in (self.x_combo, self.y_combo, self.file_button, self.reset_button, self.export_button):
+            widget.setEnabled(not live)
+        self.update_navigation_buttons()
+        for artist in self.analysis_artists():
+            artist.set_visible(not live)
+        self.live_line.set_visible(live)
+        if live:
+            self.cancel_analysis()
+            self.live_tail = LiveTail(self.data_processor.file_path, self.x_combo.currentText(),
+                                      self.y_combo.currentText(), config=self.data_processor.config)
+            self.live_line.set_data([], [])
+            self.ax.ignore_existing_data_limits = True
+            # Started first, so a first poll that fails and leaves live mode stops it for good
+            self.live_timer.start()
+            self.update_live_plot()
+        else:
+            self.live_timer.stop()
+            self.live_tail = None
+            # Run the full analysis on everything written so far
+            self.start_analysis(self.data_processor.file_path)
+
+    def update_live_plot(self):
+        """Poll the followed file and append its new samples; runs at most LIVE_REFRESH_HZ times a second."""
+        try:
+            new_samples = self.live_tail.poll()
+        except (OSError, ValueError) as e:
+            # The log was moved or deleted, or a line could not be read: stop following it
+            self.live_timer.stop()
+            self.live_button.setChecked(False)
+            self.statusBar().showMessage(f"Stopped following the live file: {e}")
+            return
+        if not new_samples:
+            return
+        tail = self.live_tail
+        self.max_point.set_offsets([tail.max_x, tail.max_value])
+        max_slope = tail.max_slope
+        self.max_slope_text.set_text('Live Stiffness: -' if max_slope is None else f'Live Stiffness: {max_slope:.4f}')
+        self.area_text.set_text(f'Area: {tail.area_under_curve:.4f}' + (' (failed)' if tail.failed else ''))
+        # Grow the data limits by the new samples only
+        self.ax.update_datalim(np.column_stack([tail.x[-new_samples:], tail.y[-new_samples:]]))
+        self.ax.autoscale_view()
+        self.draw_live_curve()
+        self.canvas.draw_idle()
+
+    def draw_live_curve(self):
+        """Fill the live line with the followed curve reduced for the current x range."""
+        x_min, x_max = sorted(self.ax.get_xlim())
+        self.live_line.set_data(*minmax_decimate(self.live_tail.sample_index, x_min, x_max,
+                                                 max(int(self.ax.bbox.width), 1)))
 
     def select_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -372,14 +744,18 @@ class PlotWindow(QMainWindow):
             "Text Files (*.txt *.TXT);;All Files (*)"
         )
         if file_path:
-            try:
-                # Process new file
-                self.data_processor = DataProcessor(file_path)
-                self.file_label.setText(f"{self.data_processor.file_name}")
-                # Reset plot
-                self.update_plot()
-            except Exception as e:
-                print(f"Error message: {str(e)}")
+            # Process the new file in the background; a file still loading is dropped
+            self.start_analysis(file_path)
+
+    def compare_folder(self):
+        from overlay_window import OverlayWindow
+
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder", self.data_processor.folder_path)
+        if folder_path:
+            if self.overlay_window is not None:
+                self.overlay_window.close()
+            self.overlay_window = OverlayWindow(folder_path, *self.plotted_axes)
+            self.overlay_window.show()
 
     def reset_interactive_points(self):
         """Reset interactive points to their original positions"""
@@ -389,99 +765,25 @@ class PlotWindow(QMainWindow):
         self.draw_custom_slope_point_two_annotation()
         self.draw_yield_point_annotation()
         self.draw_slope_annotation()
+        self.draw_partial_areas()
         
         self.canvas.draw_idle()
 
     def export_to_csv(self):
-        file_path = os.path.join(self.data_processor.folder_path, "mechanical property.csv")
-
-        if os.path.exists(file_path):
-            existing_df = pd.read_csv(file_path)
-        else:
-            existing_df = pd.DataFrame()
-
-        new_df = pd.DataFrame()
-        new_df['file name'] = [self.data_processor.file_name]
-        new_df['slope'] = [self.data_processor.custom_slope]
-        new_df['area'] = [self.data_processor.area_under_curve]
-        new_df['yield displacement'] = [self.data_processor.yield_displacement]
-        new_df['yield strength'] = [self.data_processor.yield_strength]
-        new_df['max strength'] = [self.data_processor.max_value]
-        if not existing_df.empty:
-            new_df = pd.concat([existing_df, new_df], ignore_index=True)
-        new_df.to_csv(file_path, index=False)
+        store = open_results_store(results_store_path(self.data_processor.folder_path))
+        store.upsert(self.data_processor.mechanical_properties())
 
     def draw_custom_slope_point_one_annotation(self):
-        x = self.data_processor.custom_slope_point_one[0]
-        y = self.data_processor.custom_slope_point_one[1]
-        self.interactive_points[0].set_offsets([x, y])
-        ax = self.figure.gca()
-        try: 
-            if hasattr(self, 'custom_slope_point_one_annotation') and self.custom_slope_point_one_annotation is not None:
-                self.custom_slope_point_one_annotation.remove()
-        except AttributeError:
-            pass
-        
-        self.custom_slope_point_one_annotation = ax.annotate(
-            f'({x:.4f}, {y:.4f})',
-            xy=(x, y),
-            xytext=(20, 20),
-            textcoords='offset points',
-            color='blue'
-        )
-    
+        self.analysis_plot.show_slope_point_one()
+
     def draw_custom_slope_point_two_annotation(self):
-        x = self.data_processor.custom_slope_point_two[0]
-        y = self.data_processor.custom_slope_point_two[1]
-        self.interactive_points[1].set_offsets([x, y])
-        ax = self.figure.gca()
-        if hasattr(self, 'custom_slope_point_two_annotation') and self.custom_slope_point_two_annotation is not None:
-            self.custom_slope_point_two_annotation.remove()
-        self.custom_slope_point_two_annotation = ax.annotate(
-            f'({x:.4f}, {y:.4f})',
-            xy=(x, y),
-            xytext=(20, -20),
-            textcoords='offset points',
-            color='blue'
-        )
-    
+        self.analysis_plot.show_slope_point_two()
+
     def draw_yield_point_annotation(self):
-        x = self.data_processor.yield_displacement
-        y = self.data_processor.yield_strength
-        self.interactive_points[2].set_offsets([x, y])
-        ax = self.figure.gca()
-        if hasattr(self, 'yield_point_annotation') and self.yield_point_annotation is not None:
-            self.yield_point_annotation.remove()
-        self.yield_point_annotation = ax.annotate(
-            f'({x:.4f}, {y:.4f})',
-            xy=(x, y),
-            xytext=(-80, 20),
-            textcoords='offset points',
-            color='green'
-        )
+        self.analysis_plot.show_yield_point()
+
+    def draw_partial_areas(self):
+        self.analysis_plot.show_partial_areas()
 
     def draw_slope_annotation(self):
-        self.interactive_line.set_data(
-            [self.data_processor.custom_slope_point_one[0], self.data_processor.custom_slope_point_two[0]],
-            [self.data_processor.custom_slope_point_one[1], self.data_processor.custom_slope_point_two[1]]
-        )
-        ax = self.figure.gca()
-        self.data_processor.calculate_custom_slope()
-        if hasattr(self, 'slope_annotation') and self.slope_annotation is not None:
-            self.slope_annotation.remove()
-        self.slope_annotation = ax.text(
-            0.02, 0.92,
-            f'Current Slope: {self.data_processor.custom_slope:.4f}',
-            transform=ax.transAxes,
-            bbox=dict(
-                facecolor='white',
-                edgecolor='blue',
-                alpha=0.8,
-                boxstyle='round,pad=0.5'
-            ),
-            verticalalignment='top',
-            horizontalalignment='left',
-            color='blue',
-            fontsize=10,
-            zorder=1000
-        )
\ No newline at end of file
+        self.analysis_plot.show_slope()
@@ -0,0 +1,113 @@
+"""Render the annotated plot of every test log under a folder to image files, without Qt.
+
+Usage: python report.py FOLDER [--output DIR] [--format png|pdf|svg] [--dpi N] [--workers N]
+       [--axes "Display 1:Load 1" ...]
+
+Each figure is the plot window's AnalysisPlot (max strength, stiffness line, slope
+and yield points, areas) drawn with the Agg backend, one file per specimen and axis
+pair, in a folder tree mirroring the input. Files are rendered in a process pool sized
+to the CPU count; each worker parses a file once (through the parse cache), analyses
+every requested axis pair of it and decimates the curve to the figure's pixel width
+before drawing.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from analysis_plot import AnalysisPlot
+from batch import X_COLUMN, Y_COLUMN, find_test_files
+from data_processor import DataProcessor
+from parse_cache import ParseCache
+
+REPORT_DIR_NAME = 'report'
+FIGURE_SIZE = (8, 6)
+DEFAULT_DPI = 150
+FORMATS = ('png', 'pdf', 'svg')
+
+
+def render_figure(processor, x_col, y_col, dpi=DEFAULT_DPI):
+    """Return an Agg Figure of processor, analysed for x_col and y_col."""
+    figure = Figure(figsize=FIGURE_SIZE, dpi=dpi)
+    FigureCanvasAgg(figure)
+    plot = AnalysisPlot(figure.add_subplot(111))
+    plot.ax.set_title(processor.file_name)
+    plot.show(processor, x_col, y_col)
+    plot.show_curve()
+    return figure
+
+
+def figure_path(output_dir, relative_dir, file_name, axes_pairs, x_col, y_col, fmt):
+    # The axes are only spelled out when there is more than one pair per specimen
+    name = file_name if len(axes_pairs) == 1 else f"{file_name} - {y_col} vs {x_col}"
+    return os.path.join(output_dir, relative_dir, f"{name}.{fmt}")
+
+
+def render_file(file_path, folder, output_dir, axes_pairs, fmt='png', dpi=DEFAULT_DPI):
+    """Render every axis pair of one file; returns (file_path, written paths, error)."""
+    try:
+        processor = DataProcessor(file_path, streaming=True, cache=ParseCache())
+        relative_dir = os.path.relpath(os.path.dirname(os.path.abspath(file_path)), os.path.abspath(folder))
+        written = []
+        for x_col, y_col in axes_pairs:
+            processor.set_columns(x_col, y_col)
+            path = figure_path(output_dir, relative_dir, processor.file_name, axes_pairs, x_col, y_col, fmt)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            render_figure(processor, x_col, y_col, dpi).savefig(path)
+            written.append(path)
+        return file_path, written, None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def run(folder, output_dir, axes_pairs=((X_COLUMN, Y_COLUMN),), fmt='png', dpi=DEFAULT_DPI, workers=None):
+    """Render all files under folder; returns {file path: error} for the files that failed."""
+    test_files = find_test_files(folder)
+    failures = {}
+    total = len(test_files)
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(render_file, path, folder, output_dir, axes_pairs, fmt, dpi)
+                   for path in test_files]
+        for future in as_completed(futures):
+            file_path, written, error = future.result()
+            done += 1
+            if error is None:
+                print(f"[{done}/{total}] {file_path}", file=sys.stderr)
+            else:
+                failures[file_path] = error
+                print(f"[{done}/{total}] {file_path}: FAILED ({error})", file=sys.stderr)
+    return failures
+
+
+def parse_axes(text):
+    x_col, y_col = text.split(':')
+    return x_col, y_col
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the annotated plot of every test log under a folder.")
+    parser.add_argument('folder', help="folder searched recursively for .txt test logs")
+    parser.add_argument('--output', help=f"folder for the figures (default: FOLDER/{REPORT_DIR_NAME})")
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI)
+    parser.add_argument('--axes', nargs='+', type=parse_axes, default=[(X_COLUMN, Y_COLUMN)],
+                        help="axis pairs to plot as X:Y (default: Display 1:Load 1)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    output_dir = args.output or os.path.join(args.folder, REPORT_DIR_NAME)
+    failures = run(args.folder, output_dir, args.axes, args.format, args.dpi, args.workers)
+    if failures:
+        print(f"{len(failures)} file(s) failed:", file=sys.stderr)
+        for file_path, error in failures.items():
+            print(f"  {file_path}: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Results stores for the exported mechanical properties, one row per specimen keyed by file name.
+
+CSVResultsStore appends under a file lock, so an export costs the same however many rows
+the file holds and concurrent exports from several stations cannot drop each other's rows;
+when a specimen is exported again the newest row wins. SQLiteResultsStore keeps the rows in
+an indexed table and writes a CSV on demand:
+
+    python results_store.py export "mechanical property.sqlite" [output.csv]
+"""
+import csv
+import os
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+RESULT_COLUMNS = ['file name', 'slope', 'area', 'yield displacement', 'yield strength', 'max strength']
+CSV_FILE_NAME = "mechanical property.csv"
+SQLITE_FILE_NAME = "mechanical property.sqlite"
+SQLITE_EXTENSIONS = ('.sqlite', '.db')
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _try_lock(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class FileLock:
+    """Exclusive lock on a companion .lock file, shared between processes and machines on the same share."""
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                _try_lock(self.file)
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    self.file.close()
+                    raise TimeoutError(f"Could not lock {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc_info):
+        _unlock(self.file)
+        self.file.close()
+        self.file = None
+
+
+def _value(value):
+    """Convert NumPy scalars to plain Python values for writing."""
+    return None if value is None else value if isinstance(value, str) else float(value)
+
+
+class CSVResultsStore:
+    """Append-only CSV file; reading keeps the last row written for each file name."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = os.path.join(os.path.dirname(path), '.' + os.path.basename(path) + '.lock')
+
+    def upsert(self, row):
+        self.upsert_many([row])
+
+    def upsert_many(self, rows):
+        """Append rows in one write under the lock; cost does not depend on the file size."""
+        with FileLock(self.lock_path):
+            with open(self.path, 'a+', newline='') as file:
+                writer = csv.writer(file)
+                if file.tell() == 0:
+                    writer.writerow(RESULT_COLUMNS)
+                else:
+                    # Start on a fresh line if the last write was cut short
+                    file.seek(file.tell() - 1)
+                    if file.read(1) not in ('\n', '\r'):
+                        file.write('\n')
+                writer.writerows([[_value(row.get(column)) for column in RESULT_COLUMNS] for row in rows])
+
+    def read(self):
+        """Return a DataFrame with the latest row for each file name."""
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        with FileLock(self.lock_path):
+            df = pd.read_csv(self.path)
+        return df.drop_duplicates('file name', keep='last').reset_index(drop=True)
+
+    def get(self, file_name):
+        df = self.read()
+        rows = df[df['file name'] == file_name]
+        return None if rows.empty else rows.iloc[0].to_dict()
+
+    def export_csv(self, path=None):
+        """Write the deduplicated rows to path, or compact the store in place."""
+        path = path or self.path
+        with FileLock(self.lock_path):
+            df = pd.read_csv(self.path).drop_duplicates('file name', keep='last')
+            temporary_path = path + '.tmp'
+            df.to_csv(temporary_path, index=False)
+            os.replace(temporary_path, path)
+        return path
+
+
+class SQLiteResultsStore:
+    """SQLite table with the file name as primary key, for indexed lookups on large campaigns."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "file_name TEXT PRIMARY KEY, slope REAL, area REAL, yield_displacement REAL, "
+                "yield_strength REAL, max_strength REAL, updated REAL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    def upsert(self, row):
+        self.upsert_many([row])
+
+    def upsert_many(self, rows):
+        values = [[_value(row.get(column)) for column in RESULT_COLUMNS] + [time.time()] for row in rows]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(file_name) DO UPDATE SET "
+                    "slope=excluded.slope, area=excluded.area, yield_displacement=excluded.yield_displacement, "
+                    "yield_strength=excluded.yield_strength, max_strength=excluded.max_strength, "
+                    "updated=excluded.updated", values)
+        finally:
+            connection.close()
+
+    def read(self):
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT file_name, slope, area, yield_displacement, yield_strength, max_strength "
+                "FROM results ORDER BY updated").fetchall()
+        finally:
+            connection.close()
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    def get(self, file_name):
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT file_name, slope, area, yield_displacement, yield_strength, max_strength "
+                "FROM results WHERE file_name = ?", (file_name,)).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else dict(zip(RESULT_COLUMNS, row))
+
+    def export_csv(self, path=None):
+        """Write all rows to a CSV file, by default next to the database."""
+        path = path or os.path.join(os.path.dirname(self.path), CSV_FILE_NAME)
+        self.read().to_csv(path, index=False)
+        return path
+
+
+def open_results_store(path):
+    """Open the store at path; .sqlite and .db files use SQLite, anything else CSV."""
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteResultsStore(path)
+    return CSVResultsStore(path)
+
+
+def results_store_path(folder_path):
+    """Return the store a folder exports to: its SQLite database if one exists, else the CSV file."""
+    sqlite_path = os.path.join(folder_path, SQLITE_FILE_NAME)
+    if os.path.exists(sqlite_path):
+        return sqlite_path
+    return os.path.join(folder_path, CSV_FILE_NAME)
+
+
+def main(argv):
+    if len(argv) not in (2, 3) or argv[0] != 'export':
+        print(__doc__.strip().splitlines()[-1].strip(), file=sys.stderr)
+        return 2
+    path = open_results_store(argv[1]).export_csv(argv[2] if len(argv) == 3 else None)
+    print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))